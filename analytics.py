@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+analytics.py - Post-Game Statistics From Game Journals
+
+Computes, from the journal a game wrote (see journal.py):
+- per player: tags given and received, friendly fire given and received,
+  when they captured a base, final score and score over time
+- per team: the same counts, total score and first base capture
+- an attacker x target hit matrix over the roster
+
+Journals are read as columns. With NumPy installed (HAS_NUMPY) the records
+are mapped straight onto a structured array and every statistic is a
+vectorized count, so a season of thousands of games aggregates in
+seconds; without it the same numbers are computed with plain loops.
+"""
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+import glob
+import os
+
+import journal
+from game_engine import BASE_POINTS, FRIENDLY_FIRE_PENALTY, TAG_POINTS
+
+TEAM_NAMES = ("red", "green")
+
+if HAS_NUMPY:
+    # matches journal.RECORD ("<qBbhqq"), which has no padding
+    RECORD_DTYPE = np.dtype([
+        ("elapsed_ns", "<i8"),
+        ("kind", "u1"),
+        ("team", "i1"),
+        ("points", "<i2"),
+        ("a", "<i8"),
+        ("b", "<i8"),
+    ])
+
+
+def load_columns(path):
+    """
+    Return (metadata, columns) for a journal: columns maps each record
+    field to a NumPy array, or to a list without NumPy.
+    """
+
+    if not HAS_NUMPY:
+        metadata, records = journal.read_journal(path)
+        names = ("elapsed_ns", "kind", "team", "points", "a", "b")
+        return metadata, {name: [record[i] for record in records] for i, name in enumerate(names)}
+
+    with open(path, "rb") as journal_file:
+        data = journal_file.read()
+
+    # same header and torn-tail handling as journal.read_journal()
+    metadata, offset = journal._read_header(path, data)
+    count = (len(data) - offset) // RECORD_DTYPE.itemsize
+    records = np.frombuffer(data, RECORD_DTYPE, count=count, offset=offset)
+    return metadata, {name: records[name] for name in RECORD_DTYPE.names}
+
+
+class GameStats:
+    """Statistics for one recorded game."""
+
+    def __init__(self, metadata, columns, timeline_step=10.0):
+        self.metadata = metadata
+        self.players = metadata["players"]
+        self.game_seconds = metadata.get("game_seconds", 360)
+        self.timeline_step = timeline_step
+
+        player_count = len(self.players)
+        self.timeline_times = [
+            step * timeline_step
+            for step in range(int(self.game_seconds // timeline_step) + 1)
+        ]
+
+        if HAS_NUMPY:
+            self._compute_numpy(columns, player_count)
+        else:
+            self._compute_python(columns, player_count)
+
+        self.teams = {}
+        for team in TEAM_NAMES:
+            members = [
+                slot for slot, player in enumerate(self.players) if player["team"] == team
+            ]
+            captures = [
+                self.base_captured_at[slot] for slot in members
+                if self.base_captured_at[slot] is not None
+            ]
+            self.teams[team] = {
+                "score": sum(self.scores[slot] for slot in members),
+                "tags_given": sum(self.tags_given[slot] for slot in members),
+                "tags_received": sum(self.tags_received[slot] for slot in members),
+                "friendly_fire": sum(self.friendly_fire_given[slot] for slot in members),
+                "base_captured_at": min(captures) if captures else None,
+            }
+
+    def player_rows(self):
+        """One dict per player, highest score first."""
+        rows = []
+        for slot, player in enumerate(self.players):
+            rows.append({
+                "codename": player["codename"],
+                "team": player["team"],
+                "score": self.scores[slot],
+                "tags_given": self.tags_given[slot],
+                "tags_received": self.tags_received[slot],
+                "friendly_fire_given": self.friendly_fire_given[slot],
+                "friendly_fire_received": self.friendly_fire_received[slot],
+                "base_captured_at": self.base_captured_at[slot],
+            })
+        rows.sort(key=lambda row: -row["score"])
+        return rows
+
+    def top_rivalry(self):
+        """(attacker codename, target codename, hits) of the most frequent pairing, or None."""
+        best = None
+        for attacker, row in enumerate(self.hit_matrix):
+            for target, hits in enumerate(row):
+                if hits and (best is None or hits > best[2]):
+                    best = (attacker, target, hits)
+        if best is None:
+            return None
+        return self.players[best[0]]["codename"], self.players[best[1]]["codename"], best[2]
+
+    def _slot_lookup(self):
+        # the last player with an ID wins, as in GameEngine.players_by_equipment
+        return {int(player["equipment"]): slot for slot, player in enumerate(self.players)}
+
+    def _compute_numpy(self, columns, player_count):
+        kind = columns["kind"]
+        elapsed = columns["elapsed_ns"] / 1e9
+
+        equipment = np.array([int(p["equipment"]) for p in self.players], dtype=np.int64)
+        order = np.argsort(equipment, kind="stable")
+        sorted_equipment = equipment[order]
+
+        def slots_of(values):
+            if not player_count:
+                return np.full(len(values), -1, dtype=np.int64)
+            index = np.maximum(np.searchsorted(sorted_equipment, values, side="right") - 1, 0)
+            return np.where(sorted_equipment[index] == values, order[index], -1)
+
+        attackers = slots_of(columns["a"])
+        targets = slots_of(columns["b"])
+
+        # only records between players on this roster count
+        known = (attackers >= 0) & (targets >= 0)
+        tag = (kind == journal.TAG) & known
+        friendly = (kind == journal.FRIENDLY_FIRE) & known
+        capture = (kind == journal.BASE_CAPTURE) & (attackers >= 0)
+
+        def count(mask, slots):
+            return np.bincount(slots[mask], minlength=player_count)[:player_count].tolist()
+
+        self.tags_given = count(tag, attackers)
+        self.tags_received = count(tag, targets)
+        self.friendly_fire_given = count(friendly, attackers)
+        self.friendly_fire_received = count(friendly, targets)
+
+        first_capture = np.full(player_count, np.inf)
+        np.minimum.at(first_capture, attackers[capture], elapsed[capture])
+        self.base_captured_at = [None if np.isinf(t) else float(t) for t in first_capture]
+
+        hits = tag | friendly
+        matrix = np.zeros((player_count, player_count), dtype=np.int64)
+        np.add.at(matrix, (attackers[hits], targets[hits]), 1)
+        self.hit_matrix = matrix.tolist()
+
+        # score changes: attacker of every scoring record, plus friendly fire targets
+        change_slots = np.concatenate((attackers[tag | friendly | capture], targets[friendly]))
+        change_points = np.concatenate((
+            np.where(tag, TAG_POINTS, np.where(capture, BASE_POINTS, -FRIENDLY_FIRE_PENALTY))[
+                tag | friendly | capture
+            ],
+            np.full(int(friendly.sum()), -FRIENDLY_FIRE_PENALTY),
+        ))
+        change_times = np.concatenate((elapsed[tag | friendly | capture], elapsed[friendly]))
+
+        steps = len(self.timeline_times)
+        bins = np.minimum(np.ceil(change_times / self.timeline_step).astype(np.int64), steps - 1)
+        timeline = np.zeros((player_count, steps), dtype=np.int64)
+        np.add.at(timeline, (change_slots, bins), change_points)
+        timeline = np.cumsum(timeline, axis=1)
+
+        self.score_timeline = timeline.tolist()
+        self.scores = [row[-1] for row in self.score_timeline] if steps else [0] * player_count
+
+    def _compute_python(self, columns, player_count):
+        slot_of = self._slot_lookup()
+        steps = len(self.timeline_times)
+
+        self.tags_given = [0] * player_count
+        self.tags_received = [0] * player_count
+        self.friendly_fire_given = [0] * player_count
+        self.friendly_fire_received = [0] * player_count
+        self.base_captured_at = [None] * player_count
+        self.hit_matrix = [[0] * player_count for _ in range(player_count)]
+        changes = [[0] * steps for _ in range(player_count)]
+
+        def add_change(slot, seconds, points):
+            step = min(-int(-seconds // self.timeline_step), steps - 1)
+            changes[slot][step] += points
+
+        for elapsed_ns, kind, a, b in zip(
+            columns["elapsed_ns"], columns["kind"], columns["a"], columns["b"]
+        ):
+            seconds = elapsed_ns / 1e9
+            attacker = slot_of.get(a)
+            target = slot_of.get(b)
+            if attacker is None:
+                continue
+
+            if kind == journal.TAG and target is not None:
+                self.tags_given[attacker] += 1
+                self.tags_received[target] += 1
+                self.hit_matrix[attacker][target] += 1
+                add_change(attacker, seconds, TAG_POINTS)
+            elif kind == journal.FRIENDLY_FIRE and target is not None:
+                self.friendly_fire_given[attacker] += 1
+                self.friendly_fire_received[target] += 1
+                self.hit_matrix[attacker][target] += 1
+                add_change(attacker, seconds, -FRIENDLY_FIRE_PENALTY)
+                add_change(target, seconds, -FRIENDLY_FIRE_PENALTY)
+            elif kind == journal.BASE_CAPTURE:
+                if self.base_captured_at[attacker] is None:
+                    self.base_captured_at[attacker] = seconds
+                add_change(attacker, seconds, BASE_POINTS)
+
+        self.score_timeline = []
+        for row in changes:
+            running, timeline = 0, []
+            for points in row:
+                running += points
+                timeline.append(running)
+            self.score_timeline.append(timeline)
+        self.scores = [row[-1] if row else 0 for row in self.score_timeline]
+
+
+def game_stats(path, timeline_step=10.0):
+    """GameStats for one journal file."""
+    metadata, columns = load_columns(path)
+    return GameStats(metadata, columns, timeline_step)
+
+
+def aggregate_games(paths):
+    """
+    Season totals per player ID over many journals: games played, score,
+    tags given and received, friendly fire given and base captures.
+    """
+
+    totals = {}
+    for path in paths:
+        try:
+            stats = game_stats(path)
+        except (OSError, ValueError, journal.JournalError) as error:
+            print(f"Skipping journal {path}: {error}")
+            continue
+
+        for slot, player in enumerate(stats.players):
+            entry = totals.setdefault(str(player["id"]), {
+                "codename": player["codename"],
+                "games": 0,
+                "score": 0,
+                "tags_given": 0,
+                "tags_received": 0,
+                "friendly_fire_given": 0,
+                "base_captures": 0,
+            })
+            entry["games"] += 1
+            entry["score"] += stats.scores[slot]
+            entry["tags_given"] += stats.tags_given[slot]
+            entry["tags_received"] += stats.tags_received[slot]
+            entry["friendly_fire_given"] += stats.friendly_fire_given[slot]
+            entry["base_captures"] += stats.base_captured_at[slot] is not None
+
+    return totals
+
+
+def journal_paths(directory=journal.JOURNAL_DIR):
+    """
+    Every game journal in a directory, oldest first. A relative directory
+    is under the application directory.
+    """
+
+    if not directory:
+        return []
+    directory = os.path.join(journal.BASE_DIR, directory)
+    return sorted(glob.glob(os.path.join(directory, "*.jnl")))
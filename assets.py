@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+assets.py - Shared Image Asset Cache
+
+Decodes and resizes each image once per process:
+- resized images are kept in memory, keyed by (path, size, mode)
+- Tk PhotoImages built from them are kept too, so screens that are shown
+  again (every game, every launch) reuse them
+- resized bitmaps are also written to an on-disk cache (ASSET_CACHE_DIR)
+  and reused on the next launch until the source file's mtime changes
+
+load_image() is safe to call from any thread; photo() and blank_photo()
+create Tk objects and must be called on the Tk thread.
+"""
+
+import hashlib
+import os
+import threading
+
+from PIL import Image, ImageTk
+
+from config import ASSET_CACHE_DIR
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGE_DIR = os.path.join(BASE_DIR, "assets", "images")
+
+_images = {}
+_photos = {}
+_lock = threading.Lock()
+
+
+def image_path(name):
+    """Path of a file in assets/images."""
+    return os.path.join(IMAGE_DIR, name)
+
+
+def load_image(path, size=None, mode="RGBA"):
+    """
+    Return the image at `path` converted to `mode` and, if `size` is given,
+    LANCZOS-resized to (width, height). Cached in memory and on disk.
+    """
+
+    path = os.path.abspath(path)
+    key = (path, tuple(size) if size else None, mode)
+
+    with _lock:
+        image = _images.get(key)
+    if image is not None:
+        return image
+
+    image = _load_from_disk_cache(key)
+    if image is None:
+        image = Image.open(path).convert(mode)
+        if size:
+            image = image.resize(tuple(size), Image.Resampling.LANCZOS)
+        _store_in_disk_cache(key, image)
+
+    with _lock:
+        return _images.setdefault(key, image)
+
+
+def photo(path, size=None, mode="RGBA"):
+    """A cached Tk PhotoImage of load_image(path, size, mode). Tk thread only."""
+
+    key = (os.path.abspath(path), tuple(size) if size else None, mode)
+    tk_image = _photos.get(key)
+    if tk_image is None:
+        tk_image = _photos[key] = ImageTk.PhotoImage(load_image(path, size, mode))
+    return tk_image
+
+
+def blank_photo(size):
+    """A cached fully transparent PhotoImage. Tk thread only."""
+
+    key = (None, tuple(size), "RGBA")
+    tk_image = _photos.get(key)
+    if tk_image is None:
+        tk_image = _photos[key] = ImageTk.PhotoImage(Image.new("RGBA", tuple(size), (0, 0, 0, 0)))
+    return tk_image
+
+
+def clear():
+    """Forget every cached image in memory (the disk cache is kept)."""
+    with _lock:
+        _images.clear()
+    _photos.clear()
+
+
+def _disk_cache_path(key):
+    path, size, mode = key
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:12]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    size_text = f"{size[0]}x{size[1]}" if size else "full"
+    cache_dir = os.path.join(BASE_DIR, ASSET_CACHE_DIR)
+    return os.path.join(cache_dir, f"{stem}-{size_text}-{mode}-{digest}.png")
+
+
+def _load_from_disk_cache(key):
+    if not ASSET_CACHE_DIR:
+        return None
+
+    cache_path = _disk_cache_path(key)
+    try:
+        # stale once the source has been modified after the cached copy
+        if os.stat(cache_path).st_mtime_ns < os.stat(key[0]).st_mtime_ns:
+            return None
+        with Image.open(cache_path) as cached:
+            cached.load()
+            return cached if cached.mode == key[2] else cached.convert(key[2])
+    except (OSError, ValueError):
+        return None
+
+
+def _store_in_disk_cache(key, image):
+    if not ASSET_CACHE_DIR:
+        return
+
+    cache_path = _disk_cache_path(key)
+    temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        image.save(temp_path, format="PNG")
+        os.replace(temp_path, cache_path)
+    except (OSError, ValueError):
+        # the disk cache is only an optimisation
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
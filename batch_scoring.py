@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+batch_scoring.py - Vectorized Scoring of Tag Bursts
+
+Classifies a block of (attacker, target) equipment ID pairs in one NumPy
+pass instead of one Python call per event:
+- maps equipment IDs to roster slots with a sorted lookup
+- classifies every pair as base capture / base hit without points,
+  friendly fire, enemy tag, unknown attacker or unknown target
+- sums score changes per player with np.add.at
+- builds the reply-code list in event order
+
+The outcome of each pair depends only on the roster, never on earlier
+events, so the totals match applying the rules one event at a time.
+GameEngine.process_batch uses this for large batches when NumPy is
+installed (HAS_NUMPY) and the per-event rules otherwise.
+"""
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+import journal as journal_kinds
+from game_engine import (
+    BASE_POINTS,
+    FRIENDLY_FIRE_PENALTY,
+    GREEN,
+    GREEN_BASE_CODE,
+    RED,
+    RED_BASE_CODE,
+    TAG_POINTS,
+)
+
+# Outcome of one tag event
+UNKNOWN_ATTACKER = 0
+UNKNOWN_TARGET = 1
+ENEMY_TAG = 2
+FRIENDLY_FIRE = 3
+BASE_CAPTURE = 4
+BASE_NO_POINTS = 5
+
+# outcome -> (journal record kind, points of the acting player)
+_JOURNAL_RECORDS = (
+    (journal_kinds.UNKNOWN_ATTACKER, 0),
+    (journal_kinds.UNKNOWN_TARGET, 0),
+    (journal_kinds.TAG, TAG_POINTS),
+    (journal_kinds.FRIENDLY_FIRE, -FRIENDLY_FIRE_PENALTY),
+    (journal_kinds.BASE_CAPTURE, BASE_POINTS),
+    (journal_kinds.BASE_HIT, 0),
+)
+
+
+class BatchScorer:
+    """Vectorized scoring rules for one engine's (fixed) roster."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        equipment = np.array([player.equipment for player in engine.roster], dtype=np.int64)
+        order = np.argsort(equipment, kind="stable")
+
+        self.player_count = len(equipment)
+        self.teams = np.array([player.team for player in engine.roster], dtype=np.int8)
+        self._sorted_equipment = equipment[order]
+        self._sorted_slots = order
+
+    def slots_of(self, equipment_ids):
+        """Roster slot of each equipment ID, or -1 if no player has it."""
+        if not self.player_count:
+            return np.full(len(equipment_ids), -1, dtype=np.int64)
+
+        # the last player with an ID wins, as in engine.players_by_equipment
+        index = np.searchsorted(self._sorted_equipment, equipment_ids, side="right") - 1
+        index = np.maximum(index, 0)
+        found = self._sorted_equipment[index] == equipment_ids
+        return np.where(found, self._sorted_slots[index], -1)
+
+    def classify(self, attackers, targets):
+        """Return (outcomes, attacker_slots, target_slots) for each pair."""
+
+        attacker_slots = self.slots_of(attackers)
+        target_slots = self.slots_of(targets)
+
+        known = attacker_slots >= 0
+        attacker_teams = np.where(known, self.teams[attacker_slots], -1)
+
+        # base codes take precedence over a player with the same equipment ID
+        green_base = targets == GREEN_BASE_CODE
+        red_base = targets == RED_BASE_CODE
+        base = green_base | red_base
+        scoring_team = np.where(green_base, RED, GREEN)
+
+        target_known = ~base & (target_slots >= 0)
+        target_teams = np.where(target_known, self.teams[target_slots], -2)
+
+        outcomes = np.full(len(attackers), UNKNOWN_TARGET, dtype=np.int8)
+        outcomes[target_known & (attacker_teams == target_teams)] = FRIENDLY_FIRE
+        outcomes[target_known & (attacker_teams != target_teams)] = ENEMY_TAG
+        outcomes[base & (attacker_teams == scoring_team)] = BASE_CAPTURE
+        outcomes[base & (attacker_teams != scoring_team)] = BASE_NO_POINTS
+        outcomes[~known] = UNKNOWN_ATTACKER
+
+        return outcomes, attacker_slots, target_slots
+
+    def score(self, attackers, targets):
+        """
+        Score a block of tag events given as int64 arrays.
+
+        Returns (outcomes, attacker_slots, target_slots, points, touched,
+        replies): `points` is the net change per roster slot, `touched` the
+        slots whose score changed at least once, in no particular order,
+        and `replies` the equipment IDs to broadcast, in event order.
+        """
+
+        outcomes, attacker_slots, target_slots = self.classify(attackers, targets)
+
+        enemy = outcomes == ENEMY_TAG
+        friendly = outcomes == FRIENDLY_FIRE
+        capture = outcomes == BASE_CAPTURE
+
+        points = np.zeros(self.player_count, dtype=np.int64)
+        np.add.at(points, attacker_slots[enemy], TAG_POINTS)
+        np.add.at(points, attacker_slots[capture], BASE_POINTS)
+        np.add.at(points, attacker_slots[friendly], -FRIENDLY_FIRE_PENALTY)
+        np.add.at(points, target_slots[friendly], -FRIENDLY_FIRE_PENALTY)
+
+        touched = np.unique(np.concatenate((
+            attacker_slots[enemy | friendly | capture],
+            target_slots[friendly],
+        )))
+
+        # enemy tag -> target; base hit -> attacker; friendly fire -> attacker, target
+        first = np.where(enemy, targets, attackers)
+        has_first = outcomes >= ENEMY_TAG
+        replies = np.column_stack((first, targets))[np.column_stack((has_first, friendly))]
+
+        return outcomes, attacker_slots, target_slots, points, touched, replies
+
+    def process_batch(self, messages, result):
+        """
+        Apply a batch of parsed messages to the engine, producing the same
+        log lines, replies and scores as GameEngine.process() per message.
+        Returns False, having changed nothing, if an ID does not fit in int64.
+        """
+
+        tags = [parsed for parsed in messages if parsed[0] == "tag"]
+        try:
+            attackers = np.array([parsed[1] for parsed in tags], dtype=np.int64)
+            targets = np.array([parsed[2] for parsed in tags], dtype=np.int64)
+        except OverflowError:
+            return False
+
+        outcomes, attacker_slots, target_slots, points, touched, replies = self.score(
+            attackers, targets
+        )
+        captured = np.unique(attacker_slots[outcomes == BASE_CAPTURE])
+
+        self._write_log(messages, outcomes.tolist(), attacker_slots.tolist(),
+                        target_slots.tolist(), result.log, self.engine.journal)
+        result.replies.extend(replies.tolist())
+        self.engine._apply_batch_scores(points.tolist(), touched.tolist(), captured.tolist(), result)
+        return True
+
+    def _write_log(self, messages, outcomes, attacker_slots, target_slots, log, journal):
+        """Log lines (and journal records, if journaling) in event order."""
+        roster = self.engine.roster
+        index = 0
+
+        for parsed in messages:
+            kind = parsed[0]
+            if kind == "code":
+                log.append(f"Received code {parsed[1]}")
+                if journal is not None:
+                    journal.record(journal_kinds.CODE_RECEIVED, parsed[1])
+                continue
+            if kind != "tag":
+                continue
+
+            attacker_eq, target_value = parsed[1], parsed[2]
+            outcome = outcomes[index]
+            log.append(f"Received event: {attacker_eq}:{target_value}")
+
+            if journal is not None:
+                record_kind, points = _JOURNAL_RECORDS[outcome]
+                team = -1 if outcome == UNKNOWN_ATTACKER else roster[attacker_slots[index]].team
+                journal.record(record_kind, attacker_eq, target_value, team, points)
+
+            if outcome == UNKNOWN_ATTACKER:
+                log.append(f"Unknown attacker equipment ID: {attacker_eq}")
+            else:
+                attacker = roster[attacker_slots[index]]
+                if outcome == ENEMY_TAG:
+                    target = roster[target_slots[index]]
+                    log.append(f"{attacker.codename} tagged {target.codename} (+10)")
+                elif outcome == FRIENDLY_FIRE:
+                    target = roster[target_slots[index]]
+                    log.append(
+                        f"Friendly fire: {attacker.codename} hit teammate {target.codename} (-10 each)"
+                    )
+                elif outcome == BASE_CAPTURE:
+                    base_name = "GREEN" if target_value == GREEN_BASE_CODE else "RED"
+                    log.append(f"{attacker.codename} captured {base_name} base (+100)")
+                elif outcome == BASE_NO_POINTS:
+                    base_name = "GREEN" if target_value == GREEN_BASE_CODE else "RED"
+                    log.append(f"{attacker.codename} hit {base_name} base, but no points awarded")
+                else:
+                    log.append(
+                        f"{attacker.codename} triggered unknown target/event: {target_value}"
+                    )
+
+            index += 1
@@ -3,3 +3,81 @@
 UDP_BROADCAST_ADDRESS = "127.0.0.1"
 UDP_BROADCAST_PORT = 7500
 UDP_RECEIVE_PORT = 7501
+
+# UDP transport backend: "thread" (listener thread) or "asyncio" (event loop)
+UDP_BACKEND = "thread"
+
+# UDP packet logging: 1 in N records per category is written (0 = silent)
+UDP_LOG_SAMPLE_RATES = {"tag": 1, "code": 1, "unrecognized": 1, "warning": 1, "error": 1}
+UDP_LOG_RING_SIZE = 4096
+UDP_LOG_JSON = False
+
+# Outbound UDP queue: max queued messages, seconds between sends,
+# and how long one send may block the sender thread
+UDP_SEND_QUEUE_SIZE = 256
+UDP_SEND_PACING = 0.0
+UDP_SEND_TIMEOUT = 0.5
+
+# Receive worker processes sharing the receive port via SO_REUSEPORT
+# (0 = receive on a thread in the game process)
+UDP_RECEIVE_WORKERS = 0
+
+# Queue between the UDP receiver and the game screen:
+# max pending events and overflow policy ("drop_oldest", "drop_newest", "collapse")
+UDP_EVENT_QUEUE_SIZE = 1024
+UDP_EVENT_QUEUE_POLICY = "drop_oldest"
+
+# Record all UDP traffic to this capture file when set (see udp/capture.py)
+UDP_CAPTURE_PATH = None
+
+# Socket buffer sizes in bytes (None = OS default); the kernel may cap them
+UDP_RECV_BUFFER_BYTES = 1024 * 1024
+UDP_SEND_BUFFER_BYTES = None
+
+# Seconds between samples of the kernel's receive drop counter
+UDP_DROP_MONITOR_INTERVAL = 1.0
+
+# Worker threads in the pool that subscribers of several arenas can share
+UDP_SHARED_WORKERS = 4
+
+# Most redraws per second of the play screen; UDP events arriving faster
+# are coalesced into the next frame
+UI_MAX_FPS = 30
+
+# Event log on the play screen: lines kept in the widget, and the directory
+# (relative to the application) that receives each game's full log
+# (None = no spool file)
+EVENT_LOG_MAX_LINES = 500
+EVENT_LOG_SPOOL_DIR = "logs"
+
+# Milliseconds between checks for UDP events where the Tk event loop cannot
+# be woken directly (no file handler support, e.g. Windows)
+UI_WAKEUP_FALLBACK_MS = 100
+
+# Smallest batch of UDP events that GameEngine scores in one vectorized pass
+# when NumPy is installed (None = always score event by event)
+ENGINE_VECTOR_MIN_BATCH = 256
+
+# A screen timer tick starting more than this many milliseconds after its
+# deadline counts as late in the scheduler's stats
+UI_TIMER_LATE_MS = 50
+
+# Directory (relative to the application) for pre-resized images reused
+# across launches (None = keep resized images in memory only)
+ASSET_CACHE_DIR = ".asset_cache"
+
+# Size in pixels the countdown number images are shown at; the source files
+# (assets/images/1.tif ... 30.tif) are 246x111, so this is a 2x upscale
+COUNTDOWN_FRAME_SIZE = (492, 222)
+
+# Game journal (see journal.py): directory (relative to the application) for
+# per-game journal files (None = off), seconds between group commits, and
+# seconds between fsyncs
+JOURNAL_DIR = "games"
+JOURNAL_COMMIT_INTERVAL = 0.05
+JOURNAL_FSYNC_INTERVAL = 1.0
+
+# Seconds between crash-recovery snapshots of a running game, and how old
+# (in seconds) the last snapshot may be for the game to resume on launch
+SNAPSHOT_INTERVAL = 2.0
+RESUME_MAX_AGE = 600
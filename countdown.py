@@ -3,10 +3,91 @@
 countdown.py - 30 Second Start Countdown Component
 
 Displays a countdown from 30 to 1 using countdown images.
+
+The number images are preloaded while operators are still entering
+players: a background thread decodes and scales them, then the Tk thread
+turns a few per tick into PhotoImages. Numbers whose image is not ready
+yet are shown as text.
 """
 
+import threading
+import time
 import tkinter as tk
 
+import assets
+from config import COUNTDOWN_FRAME_SIZE
+from scheduler import get_scheduler
+
+COUNTDOWN_FRAMES = 30
+
+
+class CountdownFrames:
+    """The countdown number images, loaded in the background."""
+
+    def __init__(self, widget, size=COUNTDOWN_FRAME_SIZE, count=COUNTDOWN_FRAMES):
+        self.scheduler = get_scheduler(widget)
+        self.size = size
+        self.count = count
+        self.photos = {}
+
+        # decoded images waiting for PhotoImage conversion on the Tk thread
+        self._decoded = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._convert_task = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._decode_all, name="countdown-preload", daemon=True)
+        self._thread.start()
+        self._convert_task = self.scheduler.every(0.05, self._convert_some, name="countdown-preload")
+
+    @property
+    def ready(self):
+        return len(self.photos) == self.count
+
+    def frame(self, number):
+        """The PhotoImage for `number`, or None if it is not loaded (yet)."""
+        return self.photos.get(number)
+
+    def _decode_all(self):
+        for number in range(1, self.count + 1):
+            try:
+                image = assets.load_image(assets.image_path(f"{number}.tif"), self.size, mode="RGB")
+            except Exception as error:
+                print(f"Countdown image {number}.tif unavailable: {error}")
+                continue
+            with self._lock:
+                self._decoded.append(number)
+
+    def _convert_some(self, per_tick=3):
+        with self._lock:
+            numbers = self._decoded[:per_tick]
+            del self._decoded[:per_tick]
+
+        for number in numbers:
+            # already decoded and scaled: this only copies pixels into Tk
+            self.photos[number] = assets.photo(
+                assets.image_path(f"{number}.tif"), self.size, mode="RGB"
+            )
+
+        if not self._thread.is_alive() and not self._decoded:
+            self.scheduler.cancel(self._convert_task)
+            self._convert_task = None
+
+
+_frames = None
+
+
+def preload_countdown_frames(widget):
+    """Start loading the countdown images once per process; returns the loader."""
+    global _frames
+    if _frames is None:
+        _frames = CountdownFrames(widget)
+        _frames.start()
+    return _frames
+
 
 class CountdownScreen:
     """Displays a countdown before the game starts."""
@@ -20,10 +101,15 @@ class CountdownScreen:
         self.countdown_duration = 5 if short_countdown else 30
         self.current_number = self.countdown_duration
         self.scheduled_callback = None
+        self.scheduler = get_scheduler(parent)
+        self.started = None
+        self.frames = None
         self.music = music
 
     def show(self):
         """Display the countdown screen and start the countdown."""
+        self.frames = preload_countdown_frames(self.parent)
+
         self.frame = tk.Frame(self.parent, bg="#1a1a2e")
         self.frame.pack(fill="both", expand=True)
 
@@ -59,31 +145,38 @@ class CountdownScreen:
         if self.current_number < 20:
             self.music.play_random_track(start_time=20-self.current_number)
 
-        # Start displaying countdown numbers
-        self._show_next_number()
+        # Start displaying countdown numbers, one per second
+        self.started = time.monotonic()
+        self.scheduled_callback = self.scheduler.every(
+            1.0, self._show_next_number, name="countdown", first_delay=0
+        )
 
 
     def _show_next_number(self):
-        """Display the next countdown number and schedule the next one."""
-        if self.current_number == 18:
+        """Display the countdown number for the time elapsed since the start."""
+        # read off the clock, so a late tick catches up instead of drifting
+        elapsed = round(time.monotonic() - self.started)
+        next_number = self.countdown_duration - 1 - elapsed
+
+        if self.current_number >= 18 > next_number:
             self.music.play_random_track()
 
-        if self.current_number <= 1:
+        if next_number < 1:
             self._end_countdown()
             return
 
-        self.current_number -= 1
-        self.label.config(text=self.current_number)
-
-        # Schedule next number (1 second delay)
-        self.scheduled_callback = self.parent.after(
-            1000, self._show_next_number
-        )
+        self.current_number = next_number
+        photo = self.frames.frame(self.current_number)
+        if photo is not None:
+            self.label.config(image=photo)
+        else:
+            self.label.config(image="", text=self.current_number)
 
 
     def _end_countdown(self):
         """Clean up and call the callback when countdown completes."""
-
+        self.scheduler.cancel(self.scheduled_callback)
+        self.scheduled_callback = None
 
         if self.frame:
             self.parent.unbind("<Escape>")
@@ -96,16 +189,14 @@ class CountdownScreen:
         """Cancel countdown and return to player entry."""
         self.music.stop()
         self.callback = self.cancel_callback
-        if self.scheduled_callback:
-            self.parent.after_cancel(self.scheduled_callback)
         self._end_countdown()
 
 
 
     def destroy(self):
         """Clean up resources."""
-        if self.scheduled_callback:
-            self.parent.after_cancel(self.scheduled_callback)
+        self.scheduler.cancel(self.scheduled_callback)
+        self.scheduled_callback = None
 
         if self.frame:
             self.frame.destroy()
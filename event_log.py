@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+event_log.py - Bounded Event Log View
+
+Keeps the play screen's event log cheap however long the game runs:
+- the Text widget holds at most EVENT_LOG_MAX_LINES lines; older lines are
+  trimmed off the top as new ones arrive
+- each frame's lines are inserted with one call and one state toggle
+- the most recent lines are kept in a ring buffer for redraws
+- the full history is appended to a spool file on disk
+"""
+
+import time
+from collections import deque
+
+import journal
+from config import EVENT_LOG_MAX_LINES, EVENT_LOG_SPOOL_DIR
+
+
+def new_spool_path(directory=EVENT_LOG_SPOOL_DIR):
+    """
+    Return a spool file path no other game uses, or None if spooling is
+    off. Named like the game's journal; a relative directory is under the
+    application directory.
+    """
+    return journal.new_game_path(directory, ".log")
+
+
+class EventLogView:
+    """Ring-buffer-backed view of the event log in a tk.Text widget."""
+
+    def __init__(self, text_widget, max_lines=EVENT_LOG_MAX_LINES, spool_path=None):
+        self.text = text_widget
+        self.max_lines = max_lines
+        self.lines = deque(maxlen=max_lines)
+        self.total_lines = 0
+        self.spool_path = spool_path
+
+        # lines currently in the widget
+        self._shown = 0
+        self._spool = None
+        if spool_path:
+            self._spool = open(spool_path, "a", encoding="utf-8", buffering=64 * 1024)
+
+    def append(self, lines):
+        """Add a frame's worth of lines to the view and the spool."""
+        if not lines:
+            return
+
+        self.total_lines += len(lines)
+        self.lines.extend(lines)
+
+        if self._spool is not None:
+            stamp = time.strftime("%H:%M:%S")
+            self._spool.write("".join(f"{stamp} {line}\n" for line in lines))
+
+        self.text.config(state="normal")
+
+        if len(lines) >= self.max_lines:
+            # the new lines alone fill the view: redraw from the ring buffer
+            self.text.delete("1.0", "end")
+            self.text.insert("end", "\n".join(self.lines) + "\n")
+            self._shown = len(self.lines)
+        else:
+            self.text.insert("end", "\n".join(lines) + "\n")
+            self._shown += len(lines)
+
+            excess = self._shown - self.max_lines
+            if excess > 0:
+                self.text.delete("1.0", f"{excess + 1}.0")
+                self._shown = self.max_lines
+
+        self.text.see("end")
+        self.text.config(state="disabled")
+
+    def close(self):
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+game_engine.py - Headless Game Rules
+
+Owns player state and scoring, with no Tk dependency:
+- takes parsed UDP events ("tag" / "code" tuples from udp_service)
+- applies the scoring rules
+- emits score deltas, reply codes to broadcast and event log lines
+
+PlayActionScreen renders an engine; the engine can also run on its own,
+e.g. in a server process or a benchmark.
+
+Players are compact Player records (__slots__, team as a small int) with a
+dense roster slot; the engine looks them up by equipment ID.
+
+Team totals and each team's leaderboard are maintained incrementally:
+a score change updates the running total and moves one entry in a sorted
+ranking (binary search), and the result reports the span of leaderboard
+rows that changed so a renderer can redraw only those.
+
+Large batches are scored in one vectorized pass by batch_scoring when
+NumPy is installed; the results are the same as event-by-event scoring.
+"""
+
+from bisect import bisect_left
+
+import journal as journal_kinds
+from config import ENGINE_VECTOR_MIN_BATCH
+
+GREEN_BASE_CODE = 43
+RED_BASE_CODE = 53
+
+BASE_POINTS = 100
+TAG_POINTS = 10
+FRIENDLY_FIRE_PENALTY = 10
+
+RED = 0
+GREEN = 1
+TEAMS = ("red", "green")
+
+
+class EngineResult:
+    """What processing one or more events produced."""
+
+    __slots__ = ("replies", "log", "deltas", "dirty_ranks")
+
+    def __init__(self):
+        # equipment IDs / codes to broadcast, in order
+        self.replies = []
+        # event log lines, in order
+        self.log = []
+        # equipment ID -> net score change
+        self.deltas = {}
+        # team -> (first, last) span of leaderboard rows (0 = top) whose
+        # player or score may have changed
+        self.dirty_ranks = {}
+
+    def add_delta(self, equipment, points):
+        self.deltas[equipment] = self.deltas.get(equipment, 0) + points
+
+    def mark_ranks(self, team, first, last):
+        span = self.dirty_ranks.get(team)
+        if span is None:
+            self.dirty_ranks[team] = (first, last)
+        elif first < span[0] or last > span[1]:
+            self.dirty_ranks[team] = (
+                first if first < span[0] else span[0],
+                last if last > span[1] else span[1],
+            )
+
+    @property
+    def scores_changed(self):
+        return bool(self.deltas or self.dirty_ranks)
+
+
+class Player:
+    """One player's state. `team` is RED or GREEN; `slot` is the roster position."""
+
+    __slots__ = ("id", "codename", "equipment", "team", "score", "has_base", "slot", "rank_key")
+
+    def __init__(self, player_id, codename, equipment, team, slot):
+        self.id = player_id
+        self.codename = codename
+        self.equipment = equipment
+        self.team = team
+        self.score = 0
+        self.has_base = False
+        self.slot = slot
+        # (-score, slot): sorts highest score first, ties in roster order
+        self.rank_key = (0, slot)
+
+    @property
+    def team_name(self):
+        return TEAMS[self.team]
+
+    def __repr__(self):
+        return (
+            f"Player({self.codename!r}, equipment={self.equipment}, "
+            f"team={self.team_name!r}, score={self.score})"
+        )
+
+
+class GameEngine:
+    """Player state and scoring rules for one game."""
+
+    def __init__(self, red_players, green_players):
+        # Player records in roster order (index = slot), and by equipment ID
+        self.roster = []
+        self.players_by_equipment = {}
+        # indexed by RED / GREEN
+        self.totals = [0, 0]
+
+        # Per team, sorted rank keys of its players
+        self._rankings = ([], [])
+
+        # batches at least this long use the vectorized scorer (None = never)
+        self.vector_min_batch = ENGINE_VECTOR_MIN_BATCH
+        self._batch_scorer = None
+
+        # journal.GameJournal receiving one record per event, if set
+        self.journal = None
+
+        for player in red_players:
+            self._add_player(player, RED)
+
+        for player in green_players:
+            self._add_player(player, GREEN)
+
+    def _add_player(self, player, team):
+        equipment = int(player["equipment"])
+        record = Player(player["id"], player["codename"], equipment, team, len(self.roster))
+
+        self.roster.append(record)
+        self.players_by_equipment[equipment] = record
+        self._rankings[team].append(record.rank_key)
+
+    def _add_score(self, player, points, result):
+        """Change one player's score, keeping totals and rankings current."""
+
+        team = player.team
+        ranking = self._rankings[team]
+
+        old_key = player.rank_key
+        old_rank = bisect_left(ranking, old_key)
+
+        player.score += points
+        self.totals[team] += points
+
+        new_key = (-player.score, player.slot)
+        player.rank_key = new_key
+
+        if (old_rank == 0 or ranking[old_rank - 1] < new_key) and (
+            old_rank + 1 == len(ranking) or new_key < ranking[old_rank + 1]
+        ):
+            # order unchanged: only this row's score differs
+            ranking[old_rank] = new_key
+            new_rank = old_rank
+        else:
+            del ranking[old_rank]
+            new_rank = bisect_left(ranking, new_key)
+            ranking.insert(new_rank, new_key)
+
+        result.add_delta(player.equipment, points)
+        # every row between the old and new position shows a different player
+        if old_rank < new_rank:
+            result.mark_ranks(TEAMS[team], old_rank, new_rank)
+        else:
+            result.mark_ranks(TEAMS[team], new_rank, old_rank)
+
+    def add_base(self, equipment_id, result=None):
+        player = self.players_by_equipment.get(equipment_id)
+        if player:
+            player.has_base = True
+            if result is not None:
+                rank = self.rank_of(equipment_id)
+                result.mark_ranks(player.team_name, rank, rank)
+
+    def players(self, team=None):
+        """All players, or one team's ("red" / "green") players, in roster order."""
+        if team is None:
+            return list(self.roster)
+        team = TEAMS.index(team)
+        return [p for p in self.roster if p.team == team]
+
+    def ranked_players(self, team):
+        """One team's players, highest score first."""
+        roster = self.roster
+        return [roster[key[1]] for key in self._rankings[TEAMS.index(team)]]
+
+    def player_at(self, team, rank):
+        """The player shown on leaderboard row `rank` (0 = top) of a team."""
+        return self.roster[self._rankings[TEAMS.index(team)][rank][1]]
+
+    def rank_of(self, equipment_id):
+        player = self.players_by_equipment[equipment_id]
+        return bisect_left(self._rankings[player.team], player.rank_key)
+
+    def team_totals(self):
+        """Return (red_total, green_total)."""
+        return self.totals[RED], self.totals[GREEN]
+
+    def leader(self):
+        """Return "red", "green", or None on a tie."""
+        red_total, green_total = self.team_totals()
+        if red_total > green_total:
+            return "red"
+        if green_total > red_total:
+            return "green"
+        return None
+
+    def export_state(self):
+        """Per-player [equipment, score, has_base] lists, in roster order."""
+        return [[player.equipment, player.score, player.has_base] for player in self.roster]
+
+    def restore_state(self, state):
+        """
+        Load scores and base flags saved by export_state(), then rebuild
+        totals and leaderboards. Unknown equipment IDs are ignored.
+        """
+
+        for equipment, score, has_base in state:
+            player = self.players_by_equipment.get(equipment)
+            if player is not None:
+                player.score = score
+                player.has_base = bool(has_base)
+                player.rank_key = (-score, player.slot)
+
+        for team in (RED, GREEN):
+            members = [player for player in self.roster if player.team == team]
+            self.totals[team] = sum(player.score for player in members)
+            self._rankings[team][:] = sorted(player.rank_key for player in members)
+
+    def process_batch(self, messages, result=None):
+        """Apply a batch of parsed messages in order."""
+        if result is None:
+            result = EngineResult()
+
+        if (
+            self.vector_min_batch is not None
+            and len(messages) >= self.vector_min_batch
+            and self.roster
+            and self._process_batch_vectorized(messages, result)
+        ):
+            return result
+
+        for parsed in messages:
+            self.process(parsed, result)
+        return result
+
+    def _process_batch_vectorized(self, messages, result):
+        """
+        Score a batch with batch_scoring. Returns False, having changed
+        nothing, when NumPy is unavailable or an ID does not fit in int64.
+        """
+
+        scorer = self._batch_scorer
+        if scorer is None:
+            # imported on first use: batch_scoring itself imports this module
+            from batch_scoring import HAS_NUMPY, BatchScorer
+
+            if not HAS_NUMPY:
+                self.vector_min_batch = None
+                return False
+            scorer = self._batch_scorer = BatchScorer(self)
+
+        return scorer.process_batch(messages, result)
+
+    def _apply_batch_scores(self, points, touched, captured, result):
+        """
+        Apply summed score changes (`points` per roster slot, for the slots
+        in `touched`) and base captures, then re-sort the affected
+        leaderboards once.
+        """
+
+        roster = self.roster
+        changed = [False, False]
+
+        new_bases = []
+        for slot in captured:
+            player = roster[slot]
+            if not player.has_base:
+                player.has_base = True
+                new_bases.append(player)
+                changed[player.team] = True
+
+        for slot in touched:
+            player = roster[slot]
+            player.score += points[slot]
+            self.totals[player.team] += points[slot]
+            player.rank_key = (-player.score, slot)
+            result.add_delta(player.equipment, points[slot])
+            changed[player.team] = True
+
+        for team in (RED, GREEN):
+            if changed[team]:
+                self._resort_ranking(team, result)
+
+        for player in new_bases:
+            rank = self.rank_of(player.equipment)
+            result.mark_ranks(TEAMS[player.team], rank, rank)
+
+    def _resort_ranking(self, team, result):
+        """Rebuild one team's leaderboard and mark the rows that differ."""
+
+        ranking = self._rankings[team]
+        new_ranking = sorted(
+            player.rank_key for player in self.roster if player.team == team
+        )
+
+        changed_rows = [
+            rank for rank, (old, new) in enumerate(zip(ranking, new_ranking)) if old != new
+        ]
+        ranking[:] = new_ranking
+
+        if changed_rows:
+            result.mark_ranks(TEAMS[team], changed_rows[0], changed_rows[-1])
+
+    def process(self, parsed, result=None):
+        """Apply one parsed message."""
+        if result is None:
+            result = EngineResult()
+
+        message_type = parsed[0]
+
+        if message_type == "tag":
+            attacker_eq = parsed[1]
+            target_value = parsed[2]
+            result.log.append(f"Received event: {attacker_eq}:{target_value}")
+            self.handle_tag(attacker_eq, target_value, result)
+
+        elif message_type == "code":
+            result.log.append(f"Received code {parsed[1]}")
+            if self.journal is not None:
+                self.journal.record(journal_kinds.CODE_RECEIVED, parsed[1])
+
+        return result
+
+    def handle_tag(self, attacker_eq, target_value, result):
+        attacker = self.players_by_equipment.get(attacker_eq)
+
+        journal = self.journal
+
+        if attacker is None:
+            result.log.append(f"Unknown attacker equipment ID: {attacker_eq}")
+            if journal is not None:
+                journal.record(journal_kinds.UNKNOWN_ATTACKER, attacker_eq, target_value)
+            return
+
+        if target_value == GREEN_BASE_CODE:
+            self._handle_base_hit(attacker, RED, "GREEN", result)
+            return
+
+        if target_value == RED_BASE_CODE:
+            self._handle_base_hit(attacker, GREEN, "RED", result)
+            return
+
+        target = self.players_by_equipment.get(target_value)
+
+        if target is None:
+            result.log.append(
+                f"{attacker.codename} triggered unknown target/event: {target_value}"
+            )
+            if journal is not None:
+                journal.record(
+                    journal_kinds.UNKNOWN_TARGET, attacker_eq, target_value, attacker.team
+                )
+            return
+
+        if attacker.team == target.team:
+            self._add_score(attacker, -FRIENDLY_FIRE_PENALTY, result)
+            self._add_score(target, -FRIENDLY_FIRE_PENALTY, result)
+
+            result.replies.append(attacker.equipment)
+            result.replies.append(target.equipment)
+
+            result.log.append(
+                f"Friendly fire: {attacker.codename} hit teammate {target.codename} (-10 each)"
+            )
+            if journal is not None:
+                journal.record(
+                    journal_kinds.FRIENDLY_FIRE, attacker_eq, target_value,
+                    attacker.team, -FRIENDLY_FIRE_PENALTY,
+                )
+        else:
+            self._add_score(attacker, TAG_POINTS, result)
+
+            result.replies.append(target.equipment)
+
+            result.log.append(f"{attacker.codename} tagged {target.codename} (+10)")
+            if journal is not None:
+                journal.record(
+                    journal_kinds.TAG, attacker_eq, target_value, attacker.team, TAG_POINTS
+                )
+
+    def _handle_base_hit(self, attacker, scoring_team, base_name, result):
+        base_code = GREEN_BASE_CODE if base_name == "GREEN" else RED_BASE_CODE
+
+        if attacker.team == scoring_team:
+            attacker.has_base = True
+            self._add_score(attacker, BASE_POINTS, result)
+            result.log.append(f"{attacker.codename} captured {base_name} base (+100)")
+            if self.journal is not None:
+                self.journal.record(
+                    journal_kinds.BASE_CAPTURE, attacker.equipment, base_code,
+                    attacker.team, BASE_POINTS,
+                )
+        else:
+            result.log.append(f"{attacker.codename} hit {base_name} base, but no points awarded")
+            if self.journal is not None:
+                self.journal.record(
+                    journal_kinds.BASE_HIT, attacker.equipment, base_code, attacker.team
+                )
+
+        result.replies.append(attacker.equipment)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+journal.py - Append-Only Game Event Journal
+
+Persists everything a game produces, one file per game:
+- every engine event (tag, friendly fire, base hit, unknown IDs, codes),
+  every reply code sent, and the timer ticks, as fixed-size binary records
+- record() only packs one record and appends it to an in-memory queue,
+  so it adds next to nothing to event handling
+- a background writer writes whatever is queued every
+  JOURNAL_COMMIT_INTERVAL seconds (group commit) and fsyncs at most every
+  JOURNAL_FSYNC_INTERVAL seconds, and once more on close
+- work handed to defer() (e.g. writing a snapshot) runs on the writer
+  thread once every record queued before it is on disk
+- a journal can be reopened to continue a game after a crash
+- if writing fails (disk full, I/O error) the writer stops, later records
+  are dropped, and close() raises JournalError
+
+File layout:
+    8-byte magic b"PHOTJNL1"
+    uint32 length, then that many bytes of UTF-8 JSON metadata
+    (roster, start time, game length)
+    then fixed-size records:
+        int64 elapsed_ns  (time.monotonic_ns() since the game started)
+        uint8 kind        (one of the kinds below)
+        int8  team        (acting player's team: 0 red, 1 green, -1 none)
+        int16 points      (score change of the acting player)
+        int64 a           (attacker / code / reply value / seconds remaining)
+        int64 b           (target value, or 0)
+All integers are little-endian.
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+from config import JOURNAL_COMMIT_INTERVAL, JOURNAL_DIR, JOURNAL_FSYNC_INTERVAL
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MAGIC = b"PHOTJNL1"
+
+# Record kinds
+GAME_START = 1
+GAME_END = 2
+TIMER_TICK = 3
+TAG = 4
+FRIENDLY_FIRE = 5
+BASE_CAPTURE = 6
+BASE_HIT = 7
+UNKNOWN_ATTACKER = 8
+UNKNOWN_TARGET = 9
+CODE_RECEIVED = 10
+REPLY_SENT = 11
+
+KIND_NAMES = {
+    GAME_START: "game_start",
+    GAME_END: "game_end",
+    TIMER_TICK: "timer_tick",
+    TAG: "tag",
+    FRIENDLY_FIRE: "friendly_fire",
+    BASE_CAPTURE: "base_capture",
+    BASE_HIT: "base_hit",
+    UNKNOWN_ATTACKER: "unknown_attacker",
+    UNKNOWN_TARGET: "unknown_target",
+    CODE_RECEIVED: "code_received",
+    REPLY_SENT: "reply_sent",
+}
+
+RECORD = struct.Struct("<qBbhqq")
+_pack = RECORD.pack
+_LENGTH = struct.Struct("<I")
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _clamp(value):
+    return max(_INT64_MIN, min(_INT64_MAX, value))
+
+
+class JournalError(Exception):
+    """Raised when a file is not a valid game journal."""
+
+
+def new_journal_path(directory=JOURNAL_DIR):
+    """
+    Return a journal path no existing game uses, or None if journaling is
+    off. A relative directory is under the application directory.
+    """
+    return new_game_path(directory, ".jnl")
+
+
+def new_game_path(directory, extension):
+    """
+    Return an unused path in `directory` for one game's file, or None if
+    `directory` is empty. Names carry the start time to the millisecond,
+    plus a counter if that is taken.
+    """
+    if not directory:
+        return None
+    directory = os.path.join(BASE_DIR, directory)
+    os.makedirs(directory, exist_ok=True)
+
+    now = time.time()
+    stem = time.strftime("game-%Y%m%d-%H%M%S", time.localtime(now))
+    stem += f"-{int(now * 1000) % 1000:03d}"
+    path = os.path.join(directory, stem + extension)
+    counter = 0
+    while os.path.exists(path):
+        counter += 1
+        path = os.path.join(directory, f"{stem}-{counter}{extension}")
+    return path
+
+
+class GameJournal:
+    """
+    Writes one game's records from a background thread. A new journal
+    never replaces an existing file. With resume=True an existing journal
+    is reopened and continued: a torn final record is cut off and elapsed
+    times carry on from the last record.
+    """
+
+    def __init__(
+        self,
+        path,
+        metadata=None,
+        commit_interval=JOURNAL_COMMIT_INTERVAL,
+        fsync_interval=JOURNAL_FSYNC_INTERVAL,
+        resume=False,
+    ):
+        self.path = path
+        self.commit_interval = commit_interval
+        self.fsync_interval = fsync_interval
+        self.started_ns = time.monotonic_ns()
+
+        self.records = 0
+        self.commits = 0
+        self.fsyncs = 0
+        # the OSError that stopped the writer thread, if any
+        self.error = None
+
+        if resume:
+            self.metadata, records, end = _load(path)
+            self._file = open(path, "r+b")
+            self._file.truncate(end)
+            self._file.seek(end)
+            if records:
+                self.started_ns -= records[-1][0]
+            self.records = len(records)
+        else:
+            self.metadata = metadata
+            header = json.dumps(metadata).encode("utf-8")
+            self._file = open(path, "xb")
+            self._file.write(MAGIC + _LENGTH.pack(len(header)) + header)
+
+        # records queued so far, including any already in a resumed file
+        self.queued = self.records
+
+        # deque.append / popleft are atomic, so record() needs no lock
+        self._pending = deque()
+        self._deferred = deque()
+        self._stop = threading.Event()
+        self._last_fsync = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="game-journal", daemon=True)
+        self._thread.start()
+
+    def record(self, kind, a=0, b=0, team=-1, points=0):
+        """Queue one record. Safe from any thread; never blocks on I/O."""
+        if self.error is not None:
+            return
+        elapsed = time.monotonic_ns() - self.started_ns
+        try:
+            packed = _pack(elapsed, kind, team, points, a, b)
+        except struct.error:
+            # out-of-range IDs are clamped rather than dropped
+            packed = _pack(elapsed, kind, team, points, _clamp(a), _clamp(b))
+        self._pending.append(packed)
+        self.queued += 1
+
+    def elapsed_ns(self):
+        """Game time so far, on the same clock as the records."""
+        return time.monotonic_ns() - self.started_ns
+
+    def defer(self, work):
+        """
+        Run `work()` on the writer thread after every record queued so far
+        has been written and fsynced.
+        """
+        self._deferred.append(work)
+
+    def close(self):
+        """
+        Write everything queued, fsync and close the file. Raises
+        JournalError if the journal could not be written.
+        """
+        if self._file is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        try:
+            self._file.close()
+        except OSError as error:
+            if self.error is None:
+                self.error = error
+        self._file = None
+
+        if self.error is not None:
+            raise JournalError(f"{self.path} is incomplete: {self.error}") from self.error
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.commit_interval):
+                self._commit(force_fsync=False)
+            self._commit(force_fsync=True)
+        except OSError as error:
+            # stop rather than let records pile up in memory
+            self.error = error
+            self._pending.clear()
+            self._deferred.clear()
+            print(f"Journal {self.path} stopped writing: {error}")
+
+    def _commit(self, force_fsync):
+        pending = self._pending
+        deferred = []
+        chunks = []
+
+        # take deferred work first: the records it depends on are queued already
+        while self._deferred:
+            deferred.append(self._deferred.popleft())
+        if deferred:
+            force_fsync = True
+
+        while pending:
+            chunks.append(pending.popleft())
+
+        if chunks:
+            self._file.write(b"".join(chunks))
+            self._file.flush()
+            self.records += len(chunks)
+            self.commits += 1
+
+        now = time.monotonic()
+        if force_fsync or (chunks and now - self._last_fsync >= self.fsync_interval):
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+            self.fsyncs += 1
+
+        for work in deferred:
+            try:
+                work()
+            except Exception as error:
+                print(f"Journal deferred task failed: {error}")
+
+
+def read_journal(path):
+    """
+    Return (metadata, records) for a journal, where records is a list of
+    (elapsed_ns, kind, team, points, a, b). A torn final record (from a
+    crash mid-write) is ignored.
+    """
+
+    metadata, records, _ = _load(path)
+    return metadata, records
+
+
+def _load(path):
+    """Return (metadata, records, offset just past the last complete record)."""
+
+    with open(path, "rb") as journal_file:
+        data = journal_file.read()
+
+    metadata, offset = _read_header(path, data)
+    end = offset + (len(data) - offset) // RECORD.size * RECORD.size
+    return metadata, list(RECORD.iter_unpack(data[offset:end])), end
+
+
+def _read_header(path, data):
+    if data[:len(MAGIC)] != MAGIC or len(data) < len(MAGIC) + _LENGTH.size:
+        raise JournalError(f"{path} is not a game journal")
+
+    offset = len(MAGIC)
+    (length,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    if len(data) < offset + length:
+        raise JournalError(f"{path} has a truncated header")
+
+    try:
+        metadata = json.loads(data[offset:offset + length].decode("utf-8"))
+    except ValueError as error:
+        raise JournalError(f"{path} has an unreadable header: {error}") from error
+
+    return metadata, offset + length
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+latency.py - Receive-to-Display Latency Measurement
+
+Measures how long a hit takes to reach the screen, per stage:
+- queue:   datagram read from the socket -> drained by the Tk thread
+- engine:  drained -> scoring rules applied
+- display: scoring rules applied -> widgets updated by the frame renderer
+- total:   datagram read from the socket -> widgets updated
+
+Each stage feeds a LatencyHistogram: an HDR-style log-linear histogram
+that records nanosecond values in constant time and memory with a fixed
+relative precision (worst case 1/128, under 0.8%), so percentiles stay
+accurate from microseconds to seconds. Stamps are time.monotonic_ns() values; each
+measurement follows the oldest event of a batch, i.e. the worst case.
+"""
+
+import time
+
+STAGES = ("queue", "engine", "display", "total")
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of non-negative integer values."""
+
+    # 128 linear sub-buckets per power of two: worst-case error 1/128
+    SUB_BUCKET_BITS = 8
+
+    def __init__(self):
+        self._half = 1 << (self.SUB_BUCKET_BITS - 1)
+        self.reset()
+
+    def reset(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        value = max(0, int(value))
+
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        """Smallest recorded value (to bucket precision) at or above `percent`%."""
+        if not self.count:
+            return 0
+
+        threshold = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= threshold:
+                return min(self._highest_in_bucket(index), self.max)
+        return self.max
+
+    def _index(self, value):
+        exponent = value.bit_length() - self.SUB_BUCKET_BITS
+        if exponent <= 0:
+            return value
+        return exponent * self._half + (value >> exponent)
+
+    def _highest_in_bucket(self, index):
+        if index < 2 * self._half:
+            return index
+        exponent = index // self._half - 1
+        mantissa = index - exponent * self._half
+        return ((mantissa + 1) << exponent) - 1
+
+
+class LatencyTracker:
+    """Per-stage histograms for the receive -> display path."""
+
+    def __init__(self):
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        # (received_ns, processed_ns) of the oldest event not yet on screen
+        self._undisplayed = None
+
+    def record(self, stage, nanoseconds):
+        self.histograms[stage].record(nanoseconds)
+
+    def processed(self, received_ns, dequeued_ns, processed_ns):
+        """Record a drained batch that the engine has just processed."""
+        if received_ns is not None:
+            self.record("queue", dequeued_ns - received_ns)
+        self.record("engine", processed_ns - dequeued_ns)
+
+        if self._undisplayed is None:
+            self._undisplayed = (received_ns, processed_ns)
+
+    def displayed(self, displayed_ns=None):
+        """Record that everything processed so far is now on screen."""
+        if self._undisplayed is None:
+            return
+
+        if displayed_ns is None:
+            displayed_ns = time.monotonic_ns()
+
+        received_ns, processed_ns = self._undisplayed
+        self._undisplayed = None
+
+        self.record("display", displayed_ns - processed_ns)
+        if received_ns is not None:
+            self.record("total", displayed_ns - received_ns)
+
+    def summary(self):
+        """Return {stage: {"count", "mean", "min", "max", "p50", ...}} in milliseconds."""
+        summary = {}
+        for stage, histogram in self.histograms.items():
+            stats = {
+                "count": histogram.count,
+                "mean": histogram.mean() / 1e6,
+                "min": (histogram.min or 0) / 1e6,
+                "max": (histogram.max or 0) / 1e6,
+            }
+            for percent in PERCENTILES:
+                stats[f"p{percent:g}"] = histogram.percentile(percent) / 1e6
+            summary[stage] = stats
+        return summary
+
+    def report(self):
+        """Return a printable table of the summary."""
+        columns = ["mean", "min"] + [f"p{percent:g}" for percent in PERCENTILES] + ["max"]
+        lines = [f"{'stage':<8} {'count':>7}" + "".join(f" {name:>8}" for name in columns) + "  (ms)"]
+        for stage, stats in self.summary().items():
+            lines.append(
+                f"{stage:<8} {stats['count']:>7}"
+                + "".join(f" {stats[name]:>8.3f}" for name in columns)
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self._undisplayed = None
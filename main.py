@@ -3,15 +3,19 @@
 main.py - Photon Laser Tag Main Application (UI Shell)
 
 Entry point. Coordinates screen transitions:
-    Splash Screen → Player Entry → Countdown → Play Action → Player Entry (loop)
+    Splash Screen → Player Entry → Countdown → Play Action → Results → Player Entry (loop)
 """
 
 import tkinter as tk
 from splash_screen import SplashScreen
 from player_entry import PlayerEntryScreen
-from countdown import CountdownScreen
+from countdown import CountdownScreen, preload_countdown_frames
 from play_action import PlayActionScreen
+from results_screen import ResultsScreen
+from journal import JournalError
+import analytics
 from audio import AudioController
+from snapshot import find_resumable_game
 
 
 class PhotonApp:
@@ -24,9 +28,19 @@ class PhotonApp:
         self.root.configure(bg="black")
         self.current_screen = None
         self.music = AudioController()
+        # closing the window ends the current screen cleanly, so a game the
+        # operator quit is not resumed on the next launch
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
 
     def run(self):
-        self.show_splash()
+        resume = find_resumable_game()
+        if resume is not None:
+            # the last game was interrupted: go straight back into it
+            print(f"Resuming interrupted game ({resume.seconds_remaining:.0f} s left)")
+            self.music.play_random_track()
+            self._show_game(resume.red_players, resume.green_players, resume)
+        else:
+            self.show_splash()
         self.root.mainloop()
 
     def show_splash(self):
@@ -36,6 +50,8 @@ class PhotonApp:
     def show_player_entry(self):
         self.current_screen = PlayerEntryScreen(self.root, self.start_game)
         self.current_screen.show()
+        # decode the countdown images while players are being entered
+        preload_countdown_frames(self.root)
 
     def start_game(self, red_players, green_players, short_countdown=False):
         print("Game starting!")
@@ -56,13 +72,33 @@ class PhotonApp:
         self.current_screen.show()
 
 
-    def _show_game(self, red_players, green_players):
-        self.current_screen = PlayActionScreen(
-            self.root, red_players, green_players, self.show_player_entry, self.music
+    def _show_game(self, red_players, green_players, resume=None):
+        game = PlayActionScreen(
+            self.root, red_players, green_players,
+            lambda: self.show_results(game.journal_path), self.music, resume
         )
+        self.current_screen = game
+        self.current_screen.show()
+
+    def show_results(self, journal_path):
+        if journal_path is None:
+            self.show_player_entry()
+            return
+
+        try:
+            stats = analytics.game_stats(journal_path)
+        except (OSError, ValueError, KeyError, JournalError) as error:
+            print(f"Cannot show results for {journal_path}: {error}")
+            self.show_player_entry()
+            return
+
+        self.current_screen = ResultsScreen(self.root, stats, self.show_player_entry)
         self.current_screen.show()
 
     def quit(self):
+        if self.current_screen is not None:
+            self.current_screen.destroy()
+            self.current_screen = None
         self.root.quit()
         self.root.destroy()
         self.music.quit()
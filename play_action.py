@@ -7,17 +7,32 @@ Handles:
 - team totals
 - event log
 - UDP gameplay events
+
+Scoring rules live in game_engine.GameEngine; this screen feeds it UDP
+events and renders the results. Results are accumulated between frames and
+drawn by render.FrameRenderer at most UI_MAX_FPS times a second, touching
+only the widgets whose value changed.
 """
-from PIL import Image, ImageTk
-import os
+import math
+import time
 import tkinter as tk
-from udp.udp_service import set_message_handler, send_message
-from queue import Queue, Empty
+from udp.udp_service import set_batch_message_handler, send_message, get_kernel_drops
+from udp.event_queue import EventQueue
+from game_engine import GameEngine, EngineResult
+from render import FrameRenderer, WidgetCache
+from event_log import EventLogView, new_spool_path
+from wakeup import TkWakeup
+from latency import LatencyTracker
+from scheduler import get_scheduler
+import assets
+import journal
+import snapshot
+from config import SNAPSHOT_INTERVAL
 
 class PlayActionScreen:
     """Displays the in-game action screen with teams, timer, and event log."""
 
-    def __init__(self, parent, red_players, green_players, end_callback, music):
+    def __init__(self, parent, red_players, green_players, end_callback, music, resume=None):
         self.parent = parent
         self.red_players = red_players
         self.green_players = green_players
@@ -26,7 +41,14 @@ class PlayActionScreen:
         self.frame = None
         self.music = music
 
-        self.players_by_equipment = {}
+        self.engine = GameEngine(red_players, green_players)
+        self.players_by_equipment = self.engine.players_by_equipment
+
+        # snapshot.ResumeState of a game interrupted by a crash, if resuming
+        self.resume = resume
+        if resume is not None:
+            self.engine.restore_state(resume.player_states)
+            self.engine.process_batch(resume.tail)
         self.red_score_var = tk.StringVar(value="0")
         self.green_score_var = tk.StringVar(value="0")
         self.timer_var = tk.StringVar(value="6:00")
@@ -34,7 +56,9 @@ class PlayActionScreen:
         self.red_player_rows = []
         self.green_player_rows = []
 
+        self.scheduler = get_scheduler(parent)
         self.game_seconds_remaining = 360
+        self.game_end_time = None
         self.timer_job = None
 
         self.flash_on = False
@@ -48,38 +72,24 @@ class PlayActionScreen:
         self.base_image = None
         self.empty_image = None
 
-        self.pending_udp_events = Queue()
-        self.poll_job = None
-
-        self._build_player_state()
-
-    def _build_player_state(self):
-        for player in self.red_players:
-            equipment = int(player["equipment"])
-            self.players_by_equipment[equipment] = {
-                "id": player["id"],
-                "codename": player["codename"],
-                "equipment": equipment,
-                "team": "red",
-                "score": 0,
-                "has_base": False,
-            }
-
-        for player in self.green_players:
-            equipment = int(player["equipment"])
-            self.players_by_equipment[equipment] = {
-                "id": player["id"],
-                "codename": player["codename"],
-                "equipment": equipment,
-                "team": "green",
-                "score": 0,
-                "has_base": False,
-            }
+        self.pending_udp_events = EventQueue()
+        self.udp_wakeup = None
+        self.queue_stats_var = tk.StringVar(value="")
+        self.kernel_drops_seen = 0
+
+        # state changed since the last frame; drawn by _render_frame
+        self.frame_result = EngineResult()
+        self.renderer = FrameRenderer(parent, self._render_frame)
+        self.widget_cache = WidgetCache()
+        self.event_log_view = None
+        self.latency = LatencyTracker()
+        self.journal = None
+        # kept after the game so the results screen can read it
+        self.journal_path = None
+        self.snapshot_job = None
 
     def add_base(self, equipment_id):
-        player = self.players_by_equipment.get(equipment_id)
-        if player:
-            player["has_base"] = True
+        self.engine.add_base(equipment_id)
 
     def show(self):
         self.frame = tk.Frame(self.parent, bg="#1a1a2e")
@@ -91,14 +101,10 @@ class PlayActionScreen:
         self.frame.grid_rowconfigure(1, weight=1)
         self.frame.grid_rowconfigure(2, weight=1)
 
-        img = Image.open(os.path.join("assets", "images", "Trophy.png")).convert("RGBA")
-        img = img.resize((25, 25), Image.LANCZOS)
-        self.trophy_image = ImageTk.PhotoImage(img)
-        self.empty_image = ImageTk.PhotoImage(Image.new("RGBA", (25, 25), (0, 0, 0, 0)))
-
-        base_img = Image.open(os.path.join("assets", "images", "baseicon.jpg")).convert("RGBA")
-        base_img = base_img.resize((25, 25), Image.LANCZOS)
-        self.base_image = ImageTk.PhotoImage(base_img)
+        # decoded and resized once per process, then reused every game
+        self.trophy_image = assets.photo(assets.image_path("Trophy.png"), (25, 25))
+        self.empty_image = assets.blank_photo((25, 25))
+        self.base_image = assets.photo(assets.image_path("baseicon.jpg"), (25, 25))
 
 
         header = tk.Frame(self.frame, bg="#1a1a2e")
@@ -187,13 +193,22 @@ class PlayActionScreen:
 
         self.parent.bind("<F5>", lambda e: self._return_to_player_entry())
 
-        set_message_handler(self._handle_udp_message)
+        # the receive thread wakes the Tk loop when events are queued
+        self.udp_wakeup = TkWakeup(self.parent, self._process_udp_events)
+        set_batch_message_handler(self._handle_udp_batch)
+        self.kernel_drops_seen = get_kernel_drops()
         self._refresh_scores()
-        self._log_event("Game started")
+        if self.resume is None:
+            self._log_event("Game started")
+        else:
+            self._log_event(
+                f"Game resumed after a restart ({len(self.resume.tail)} events replayed)"
+            )
+        self.renderer.flush_now()
+        self._open_journal()
         self._start_game_timer()
         self._start_score_flash()
-        self._poll_udp_queue()
-        send_message(202)
+        self._send(202)
 
     def _update_trophies(self, winner):
         # clear first (stable state, no flicker loop)
@@ -242,17 +257,14 @@ class PlayActionScreen:
         ).pack(side="right")
 
         rows = self.red_player_rows if team_key == "red" else self.green_player_rows
-        players = [
-            player for player in self.players_by_equipment.values()
-            if player["team"] == team_key
-        ]
+        players = self.engine.players(team_key)
 
         for player in players:
             row = tk.Frame(panel, bg="#0f0f23")
             row.pack(fill="x", padx=15, pady=2)
 
-            name_var = tk.StringVar(value=player["codename"])
-            score_var = tk.StringVar(value=str(player["score"]))
+            name_var = tk.StringVar(value=player.codename)
+            score_var = tk.StringVar(value=str(player.score))
 
             base_label = tk.Label(
                 row,
@@ -280,7 +292,7 @@ class PlayActionScreen:
             ).pack(side="right")
 
             rows.append({
-                "equipment": player["equipment"],
+                "equipment": player.equipment,
                 "name_var": name_var,
                 "score_var": score_var,
                 "base_label": base_label,
@@ -306,6 +318,14 @@ class PlayActionScreen:
             bg="#0f0f23",
         ).pack(pady=10)
 
+        tk.Label(
+            panel,
+            textvariable=self.queue_stats_var,
+            font=("Helvetica", 10),
+            fg="gray",
+            bg="#0f0f23",
+        ).pack(side="bottom", pady=(0, 10))
+
     def _create_event_log(self):
         log_frame = tk.Frame(self.frame, bg="#0f0f23", bd=2, relief="groove")
         log_frame.grid(row=2, column=0, columnspan=3, padx=10, pady=10, sticky="nsew")
@@ -337,6 +357,8 @@ class PlayActionScreen:
         self.event_log.pack(side="left", fill="both", expand=True)
         scrollbar.config(command=self.event_log.yview)
 
+        self.event_log_view = EventLogView(self.event_log, spool_path=new_spool_path())
+
     def _create_footer(self):
         footer = tk.Frame(self.frame, bg="#1a1a2e")
         footer.grid(row=3, column=0, columnspan=3, pady=15)
@@ -353,28 +375,53 @@ class PlayActionScreen:
         ).pack()
 
     def _start_game_timer(self):
-        self.game_seconds_remaining = 360
+        duration = 360 if self.resume is None else self.resume.seconds_remaining
+        self.game_seconds_remaining = math.ceil(duration)
+        self.game_end_time = time.monotonic() + duration
         self._update_timer_display()
-        self._tick_timer()
+        # tick whenever a whole second remains, so the last tick lands on the
+        # end time even when a resumed game has a fractional second left
+        first_delay = duration - math.floor(duration) or 1.0
+        self.timer_job = self.scheduler.every(
+            1.0, self._tick_timer, name="game-timer", first_delay=first_delay
+        )
 
     def _tick_timer(self):
-        if self.game_seconds_remaining <= 0:
-            self.timer_var.set("0:00")
+        # read off the clock, so late ticks never make the game run long;
+        # rounded up, so 0:00 only shows once the time is really over
+        remaining = self.game_end_time - time.monotonic()
+        self.game_seconds_remaining = max(0, math.ceil(remaining))
+
+        if remaining <= 0:
+            self.widget_cache.set_var(self.timer_var, "0:00")
             self._log_event("Game over")
             self._end_game()
             return
 
-        self.game_seconds_remaining -= 1
         self._update_timer_display()
-        self.timer_job = self.parent.after(1000, self._tick_timer)
+        if self.journal is not None:
+            self.journal.record(journal.TIMER_TICK, self.game_seconds_remaining)
+        self._check_kernel_drops()
+        self._update_queue_stats()
 
     def _update_timer_display(self):
         minutes = self.game_seconds_remaining // 60
         seconds = self.game_seconds_remaining % 60
-        self.timer_var.set(f"{minutes}:{seconds:02d}")
+        self.widget_cache.set_var(self.timer_var, f"{minutes}:{seconds:02d}")
+
+    def _check_kernel_drops(self):
+        drops = get_kernel_drops()
+        if drops > self.kernel_drops_seen:
+            self._log_event(
+                f"WARNING: {drops - self.kernel_drops_seen} UDP packets dropped by the system "
+                "(not missed shots)"
+            )
+            self.kernel_drops_seen = drops
 
     def _start_score_flash(self):
-        self._flash_score_labels()
+        self.flash_job = self.scheduler.every(
+            0.5, self._flash_score_labels, name="score-flash", first_delay=0
+        )
 
     def _flash_score_labels(self):
         red_total = int(self.red_score_var.get())
@@ -382,126 +429,79 @@ class PlayActionScreen:
 
         self.flash_on = not self.flash_on
 
-        # reset defaults first
-        self.red_score_title_label.config(fg="#ff4444")
-        self.green_score_title_label.config(fg="#44ff44")
-        self.red_score_value_label.config(fg="white")
-        self.green_score_value_label.config(fg="white")
+        red_title, red_value = "#ff4444", "white"
+        green_title, green_value = "#44ff44", "white"
 
         if red_total > green_total:
             if self.flash_on:
-                self.red_score_title_label.config(fg="white")
-                self.red_score_value_label.config(fg="#ff4444")
+                red_title, red_value = "white", "#ff4444"
 
         elif green_total > red_total:
             if self.flash_on:
-                self.green_score_title_label.config(fg="white")
-                self.green_score_value_label.config(fg="#44ff44")
-
-        self.flash_job = self.parent.after(500, self._flash_score_labels)
-
-    def _handle_udp_message(self, parsed):
-        self.pending_udp_events.put(parsed)
-
-    def _poll_udp_queue(self):
-        try:
-            while True:
-                parsed = self.pending_udp_events.get_nowait()
-                self._process_udp_message(parsed)
-        except Empty:
-            pass
-
-        self.poll_job = self.parent.after(100, self._poll_udp_queue)
-
-    def _process_udp_message(self, parsed):
-        message_type = parsed[0]
-
-        if message_type == "tag":
-            attacker_eq = parsed[1]
-            target_value = parsed[2]
-            self._log_event(f"Received event: {attacker_eq}:{target_value}")
-            self._handle_tag_event(attacker_eq, target_value)
-
-        elif message_type == "code":
-            self._log_event(f"Received code {parsed[1]}")
-
-    def _handle_tag_event(self, attacker_eq, target_value):
-        attacker = self.players_by_equipment.get(attacker_eq)
-
-        if attacker is None:
-            self._log_event(f"Unknown attacker equipment ID: {attacker_eq}")
-            return
-
-        if target_value == 43:
-            if attacker["team"] == "red":
-                attacker["score"] += 100
-                attacker["has_base"] = True
-                self._log_event(f"{attacker['codename']} captured GREEN base (+100)")
-            else:
-                self._log_event(f"{attacker['codename']} hit GREEN base, but no points awarded")
-            send_message(attacker["equipment"])
-            self._refresh_scores()
-            return
-
-        if target_value == 53:
-            if attacker["team"] == "green":
-                attacker["score"] += 100
-                attacker["has_base"] = True
-                self._log_event(f"{attacker['codename']} captured RED base (+100)")
-            else:
-                self._log_event(f"{attacker['codename']} hit RED base, but no points awarded")
-            send_message(attacker["equipment"])
-            self._refresh_scores()
-            return
-
-        target = self.players_by_equipment.get(target_value)
-
-        if target is None:
-            self._log_event(f"{attacker['codename']} triggered unknown target/event: {target_value}")
-            return
-
-        if attacker["team"] == target["team"]:
-            attacker["score"] -= 10
-            target["score"] -= 10
-
-            send_message(attacker["equipment"])
-            send_message(target["equipment"])
-
-            self._log_event(
-                f"Friendly fire: {attacker['codename']} hit teammate {target['codename']} (-10 each)"
-            )
-        else:
-            attacker["score"] += 10
-
-            send_message(target["equipment"])
-
-            self._log_event(
-                f"{attacker['codename']} tagged {target['codename']} (+10)"
-            )
-
-        self._refresh_scores()
+                green_title, green_value = "white", "#44ff44"
+
+        # only labels whose colour changes are reconfigured
+        cache = self.widget_cache
+        cache.config(self.red_score_title_label, fg=red_title)
+        cache.config(self.red_score_value_label, fg=red_value)
+        cache.config(self.green_score_title_label, fg=green_title)
+        cache.config(self.green_score_value_label, fg=green_value)
+
+    def _handle_udp_batch(self, batch):
+        # one locked put per drained batch instead of one per packet
+        self.pending_udp_events.put_many(batch, getattr(batch, "received_ns", None))
+        wakeup = self.udp_wakeup
+        if wakeup is not None:
+            wakeup.notify()
+
+    def _process_udp_events(self):
+        events, received_ns = self.pending_udp_events.drain_timed()
+        if events:
+            dequeued_ns = time.monotonic_ns()
+            result = self.engine.process_batch(events, self.frame_result)
+            self.latency.processed(received_ns, dequeued_ns, time.monotonic_ns())
+            self._apply_engine_result(result)
+
+    def _apply_engine_result(self, result):
+        # replies go out now; log lines and score changes wait for the frame
+        for value in result.replies:
+            self._send(value)
+        result.replies.clear()
+
+        if result.log or result.scores_changed:
+            self.renderer.mark_dirty()
+
+    def _render_frame(self):
+        result = self.frame_result
+        self.frame_result = EngineResult()
+
+        if result.log:
+            self._write_log(result.log)
+
+        if result.scores_changed:
+            self._refresh_scores(result.dirty_ranks)
+
+        self.latency.displayed()
+
+    def _update_queue_stats(self):
+        stats = self.pending_udp_events.stats()
+        total = self.latency.histograms["total"]
+        text = (
+            f"Queue peak {stats['high_water']}  |  "
+            f"dropped {stats['dropped']}  |  collapsed {stats['collapsed']}  |  "
+            f"hit-to-screen p99 {total.percentile(99) / 1e6:.1f} ms"
+        )
+        self.widget_cache.set_var(self.queue_stats_var, text)
 
-    def _refresh_scores(self):
-        red_total = 0
-        green_total = 0
+    def _refresh_scores(self, dirty_ranks=None):
+        red_total, green_total = self.engine.team_totals()
 
-        for player in self.players_by_equipment.values():
-            if player["team"] == "red":
-                red_total += player["score"]
-            else:
-                green_total += player["score"]
+        self.widget_cache.set_var(self.red_score_var, str(red_total))
+        self.widget_cache.set_var(self.green_score_var, str(green_total))
 
-        self.red_score_var.set(str(red_total))
-        self.green_score_var.set(str(green_total))
+        self._refresh_team_rows(dirty_ranks)
 
-        self._refresh_team_rows()
-
-        if red_total > green_total:
-            winner = "red"
-        elif green_total > red_total:
-            winner = "green"
-        else:
-            winner = None
+        winner = self.engine.leader()
 
         if winner != self.current_winner:
             self.current_winner = winner
@@ -512,74 +512,152 @@ class PlayActionScreen:
                 self._update_trophies(winner)
         
 
-    def _refresh_team_rows(self):
-        red_players = sorted(
-            [p for p in self.players_by_equipment.values() if p["team"] == "red"],
-            key=lambda player: player["score"],
-            reverse=True,
-        )
+    def _refresh_team_rows(self, dirty_ranks=None):
+        """
+        Redraw leaderboard rows. With dirty_ranks (team -> (first, last) row
+        span, from an EngineResult) only those rows are touched; otherwise
+        all of them.
+        """
+        for team, rows in (("red", self.red_player_rows), ("green", self.green_player_rows)):
+            if dirty_ranks is None:
+                ranks = range(len(rows))
+            elif team in dirty_ranks:
+                first, last = dirty_ranks[team]
+                ranks = range(first, last + 1)
+            else:
+                continue
+
+            cache = self.widget_cache
+            for rank in ranks:
+                row = rows[rank]
+                player = self.engine.player_at(team, rank)
+                cache.set_var(row["name_var"], player.codename)
+                cache.set_var(row["score_var"], str(player.score))
+                icon = self.base_image if player.has_base else self.empty_image
+                cache.config(row["base_label"], image=icon)
 
-        green_players = sorted(
-            [p for p in self.players_by_equipment.values() if p["team"] == "green"],
-            key=lambda player: player["score"],
-            reverse=True,
+    def _log_event(self, text):
+        self.frame_result.log.append(text)
+        self.renderer.mark_dirty()
+
+    def _write_log(self, lines):
+        # one insert and one scroll per frame, however many lines arrived
+        self.event_log_view.append(lines)
+
+    def _send(self, value):
+        send_message(value)
+        if self.journal is not None:
+            self.journal.record(journal.REPLY_SENT, value)
+
+    def _open_journal(self):
+        if self.resume is not None:
+            self.journal = journal.GameJournal(self.resume.journal_path, resume=True)
+            self.journal_path = self.resume.journal_path
+            self.engine.journal = self.journal
+            self._start_snapshots()
+            return
+
+        path = journal.new_journal_path()
+        if path is None:
+            return
+
+        metadata = {
+            "version": 1,
+            "started": time.time(),
+            "game_seconds": self.game_seconds_remaining,
+            "players": [
+                {
+                    "id": player.id,
+                    "codename": player.codename,
+                    "equipment": player.equipment,
+                    "team": player.team_name,
+                }
+                for player in self.engine.roster
+            ],
+        }
+        self.journal = journal.GameJournal(path, metadata)
+        self.journal_path = path
+        self.journal.record(journal.GAME_START, self.game_seconds_remaining)
+        self.engine.journal = self.journal
+        self._start_snapshots()
+
+    def _start_snapshots(self):
+        self.snapshot_job = self.scheduler.every(
+            SNAPSHOT_INTERVAL, self._take_snapshot, name="game-snapshot"
         )
 
-        for row, player in zip(self.red_player_rows, red_players):
-            row["name_var"].set(player["codename"])
-            row["score_var"].set(str(player["score"]))
-            icon = self.base_image if player["has_base"] else self.empty_image
-            row["base_label"].config(image=icon)
+    def _take_snapshot(self):
+        # captured on the Tk thread, so it matches journal.queued exactly;
+        # written by the journal thread once those records are on disk
+        state = {
+            "version": snapshot.SNAPSHOT_VERSION,
+            "elapsed_ns": self.journal.elapsed_ns(),
+            "records": self.journal.queued,
+            "players": self.engine.export_state(),
+        }
+        path = snapshot.snapshot_path(self.journal.path)
+        self.journal.defer(lambda: snapshot.write_snapshot(path, state))
+
+    def _close_journal(self):
+        if self.journal is None:
+            return
 
-        for row, player in zip(self.green_player_rows, green_players):
-            row["name_var"].set(player["codename"])
-            row["score_var"].set(str(player["score"]))
-            icon = self.base_image if player["has_base"] else self.empty_image
-            row["base_label"].config(image=icon)
+        self.scheduler.cancel(self.snapshot_job)
+        self.snapshot_job = None
 
-    def _log_event(self, text):
-        self.event_log.config(state="normal")
-        self.event_log.insert("end", text + "\n")
-        self.event_log.see("end")
-        self.event_log.config(state="disabled")
+        red_total, green_total = self.engine.team_totals()
+        self.journal.record(journal.GAME_END, red_total, green_total)
+        self.engine.journal = None
+        try:
+            self.journal.close()
+        except journal.JournalError as error:
+            print(f"Game journal failed: {error}")
+        # a game that was closed cleanly is not resumed
+        snapshot.discard_snapshot(self.journal.path)
+        self.journal = None
 
     def _end_game(self):
-        set_message_handler(None)
+        set_batch_message_handler(None)
 
-        if self.timer_job is not None:
-            self.parent.after_cancel(self.timer_job)
-            self.timer_job = None
+        self.scheduler.cancel(self.timer_job)
+        self.timer_job = None
 
-        if self.flash_job is not None:
-            self.parent.after_cancel(self.flash_job)
-            self.flash_job = None
+        self.scheduler.cancel(self.flash_job)
+        self.flash_job = None
 
-        if self.poll_job is not None:
-            self.parent.after_cancel(self.poll_job)
-            self.poll_job = None
+        if self.udp_wakeup is not None:
+            self.udp_wakeup.close()
+            self.udp_wakeup = None
 
-        send_message(221)
-        send_message(221)
-        send_message(221)
+        self._send(221)
+        self._send(221)
+        self._send(221)
 
+        self._close_journal()
+        self.renderer.flush_now()
+        print("Receive-to-display latency:")
+        print(self.latency.report())
+        print(self.scheduler.report())
         self.parent.unbind("<F5>")
         self.game_status_label.config(text="GAME OVER", fg="#ffcc00")
 
     def destroy(self):
-        set_message_handler(None)
+        set_batch_message_handler(None)
 
-        if self.timer_job is not None:
-            self.parent.after_cancel(self.timer_job)
-            self.timer_job = None
+        self.scheduler.cancel(self.timer_job)
+        self.timer_job = None
 
-        if self.flash_job is not None:
-            self.parent.after_cancel(self.flash_job)
-            self.flash_job = None
+        self.scheduler.cancel(self.flash_job)
+        self.flash_job = None
 
-        if self.poll_job is not None:
-            self.parent.after_cancel(self.poll_job)
-            self.poll_job = None
+        if self.udp_wakeup is not None:
+            self.udp_wakeup.close()
+            self.udp_wakeup = None
 
+        self._close_journal()
+        self.renderer.cancel()
+        if self.event_log_view is not None:
+            self.event_log_view.close()
         self.parent.unbind("<F5>")
         if self.frame:
             self.frame.destroy()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+render.py - Frame-Coalesced Rendering Helpers
+
+FrameRenderer turns any number of "something changed" notifications into
+at most one redraw per frame, capped at a configurable frame rate.
+WidgetCache remembers what each widget currently displays so a redraw only
+touches the widgets whose value actually changed.
+"""
+
+import time
+
+from config import UI_MAX_FPS
+from scheduler import get_scheduler
+
+
+class FrameRenderer:
+    """Schedules one flush callback per frame while there is dirty state."""
+
+    def __init__(self, widget, flush, fps=UI_MAX_FPS):
+        self.scheduler = get_scheduler(widget)
+        self.flush = flush
+        self.frame_seconds = 1.0 / fps
+        self.job = None
+        self.last_flush = 0.0
+        self.frames = 0
+
+    def mark_dirty(self):
+        """Request a redraw; repeated calls before the next frame coalesce."""
+        if self.job is not None:
+            return
+
+        wait = self.last_flush + self.frame_seconds - time.monotonic()
+        self.job = self.scheduler.once(max(0.0, wait), self._run, name="render")
+
+    def flush_now(self):
+        """Run a pending redraw immediately (e.g. before the screen changes)."""
+        if self.job is None:
+            return
+        self.scheduler.cancel(self.job)
+        self._run()
+
+    def cancel(self):
+        if self.job is not None:
+            self.scheduler.cancel(self.job)
+            self.job = None
+
+    def _run(self):
+        self.job = None
+        self.last_flush = time.monotonic()
+        self.frames += 1
+        self.flush()
+
+
+class WidgetCache:
+    """Applies widget updates only when the displayed value differs."""
+
+    def __init__(self):
+        self._values = {}
+
+    def set_var(self, var, value):
+        key = str(var)
+        if self._values.get(key) != value:
+            self._values[key] = value
+            var.set(value)
+
+    def config(self, widget, **options):
+        changed = {}
+        for option, value in options.items():
+            key = (str(widget), option)
+            if self._values.get(key) != value:
+                self._values[key] = value
+                changed[option] = value
+
+        if changed:
+            widget.config(**changed)
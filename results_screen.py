@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+results_screen.py - Post-Game Results Screen
+
+Shown after a game ends. Reads the game's journal through analytics.py
+and displays:
+- team totals and which team captured a base first
+- one row per player: score, tags given/received, friendly fire, base time
+- both teams' scores over time, and the most frequent attacker/target pair
+- on request, season totals over every recorded game, aggregated on a
+  background thread so the window stays responsive
+
+F5 or the Continue button returns to player entry.
+"""
+
+import threading
+import tkinter as tk
+
+import analytics
+from scheduler import get_scheduler
+
+TEAM_COLORS = {"red": "#ff4444", "green": "#44ff44"}
+PLAYER_COLUMNS = (
+    ("Codename", "codename", 14),
+    ("Score", "score", 7),
+    ("Tags", "tags_given", 6),
+    ("Tagged", "tags_received", 7),
+    ("FF", "friendly_fire_given", 4),
+    ("Base", "base_captured_at", 7),
+)
+SEASON_ROWS = 10
+
+
+def _format_time(seconds):
+    if seconds is None:
+        return "-"
+    return f"{int(seconds) // 60}:{int(seconds) % 60:02d}"
+
+
+class ResultsScreen:
+    """Statistics for the game that just finished."""
+
+    def __init__(self, parent, stats, done_callback):
+        self.parent = parent
+        self.stats = stats
+        self.done_callback = done_callback
+        self.frame = None
+        self.season_frame = None
+
+        self.scheduler = get_scheduler(parent)
+        # [totals] once the season aggregation thread is done
+        self._season_result = []
+        self._season_thread = None
+        self._season_task = None
+
+    def show(self):
+        self.frame = tk.Frame(self.parent, bg="#0f0f23")
+        self.frame.pack(fill="both", expand=True)
+
+        tk.Label(
+            self.frame, text="GAME RESULTS",
+            font=("Helvetica", 24, "bold"), fg="#ffcc00", bg="#0f0f23",
+        ).pack(pady=10)
+
+        teams = tk.Frame(self.frame, bg="#0f0f23")
+        teams.pack(fill="x", padx=20)
+        for column, team in enumerate(analytics.TEAM_NAMES):
+            self._create_team_panel(teams, team, column)
+            teams.grid_columnconfigure(column, weight=1)
+
+        self._create_timeline(self.frame)
+
+        rivalry = self.stats.top_rivalry()
+        if rivalry is not None:
+            attacker, target, hits = rivalry
+            tk.Label(
+                self.frame, text=f"Most hits: {attacker} on {target} ({hits})",
+                font=("Helvetica", 12), fg="white", bg="#0f0f23",
+            ).pack(pady=5)
+
+        buttons = tk.Frame(self.frame, bg="#0f0f23")
+        buttons.pack(pady=10)
+        tk.Button(
+            buttons, text="Season Stats", command=self._show_season,
+            font=("Helvetica", 12), width=14,
+        ).pack(side="left", padx=10)
+        tk.Button(
+            buttons, text="F5 Continue", command=self._continue,
+            font=("Helvetica", 12), width=14,
+        ).pack(side="left", padx=10)
+
+        self.parent.bind("<F5>", lambda e: self._continue())
+
+    def _create_team_panel(self, parent, team, column):
+        color = TEAM_COLORS[team]
+        totals = self.stats.teams[team]
+
+        panel = tk.Frame(parent, bg="#0f0f23", bd=2, relief="groove")
+        panel.grid(row=0, column=column, sticky="nsew", padx=10)
+
+        tk.Label(
+            panel, text=f"{team.upper()} TEAM  {totals['score']}",
+            font=("Helvetica", 16, "bold"), fg=color, bg="#0f0f23",
+        ).grid(row=0, column=0, columnspan=len(PLAYER_COLUMNS), pady=5)
+
+        tk.Label(
+            panel,
+            text=(
+                f"Tags {totals['tags_given']}  Tagged {totals['tags_received']}  "
+                f"Friendly fire {totals['friendly_fire']}  "
+                f"Base {_format_time(totals['base_captured_at'])}"
+            ),
+            font=("Helvetica", 10), fg="white", bg="#0f0f23",
+        ).grid(row=1, column=0, columnspan=len(PLAYER_COLUMNS))
+
+        for index, (heading, _, width) in enumerate(PLAYER_COLUMNS):
+            tk.Label(
+                panel, text=heading, width=width, anchor="w",
+                font=("Helvetica", 10, "bold"), fg=color, bg="#0f0f23",
+            ).grid(row=2, column=index)
+
+        rows = [row for row in self.stats.player_rows() if row["team"] == team]
+        for row_index, row in enumerate(rows, start=3):
+            for index, (_, key, width) in enumerate(PLAYER_COLUMNS):
+                value = row[key]
+                if key == "base_captured_at":
+                    value = _format_time(value)
+                tk.Label(
+                    panel, text=str(value), width=width, anchor="w",
+                    font=("Helvetica", 10), fg="white", bg="#0f0f23",
+                ).grid(row=row_index, column=index)
+
+    def _create_timeline(self, parent):
+        """Both teams' scores over the game as a line chart."""
+        width, height, margin = 600, 160, 10
+        canvas = tk.Canvas(
+            parent, width=width, height=height, bg="#0f0f23", highlightthickness=0
+        )
+        canvas.pack(pady=10)
+
+        series = {}
+        for team in analytics.TEAM_NAMES:
+            slots = [
+                slot for slot, player in enumerate(self.stats.players) if player["team"] == team
+            ]
+            series[team] = [
+                sum(self.stats.score_timeline[slot][step] for slot in slots)
+                for step in range(len(self.stats.timeline_times))
+            ]
+
+        values = [value for points in series.values() for value in points]
+        low, high = min(values + [0]), max(values + [1])
+        steps = len(self.stats.timeline_times)
+        if steps < 2:
+            return
+
+        def point(step, value):
+            x = margin + step * (width - 2 * margin) / (steps - 1)
+            y = height - margin - (value - low) * (height - 2 * margin) / (high - low)
+            return x, y
+
+        canvas.create_line(*point(0, 0), *point(steps - 1, 0), fill="#444466")
+        for team, points in series.items():
+            coords = [c for step, value in enumerate(points) for c in point(step, value)]
+            canvas.create_line(*coords, fill=TEAM_COLORS[team], width=2)
+
+    def _show_season(self):
+        if self._season_thread is not None:
+            # still aggregating
+            return
+
+        if self.season_frame is not None:
+            self.season_frame.destroy()
+            self.season_frame = None
+            return
+
+        self.season_frame = tk.Frame(self.frame, bg="#0f0f23", bd=2, relief="groove")
+        self.season_frame.pack(pady=5)
+        tk.Label(
+            self.season_frame, text="Loading season stats...",
+            font=("Helvetica", 10), fg="white", bg="#0f0f23",
+        ).grid(row=0, column=0)
+
+        self._season_result = []
+        self._season_thread = threading.Thread(
+            target=self._aggregate_season, name="season-stats", daemon=True
+        )
+        self._season_thread.start()
+        self._season_task = self.scheduler.every(0.1, self._check_season, name="season-stats")
+
+    def _aggregate_season(self):
+        """Worker thread: reads every recorded journal."""
+        try:
+            totals = analytics.aggregate_games(analytics.journal_paths())
+        except Exception as error:
+            print(f"Season stats unavailable: {error}")
+            return
+        self._season_result.append(totals)
+
+    def _check_season(self):
+        if self._season_thread.is_alive():
+            return
+
+        self.scheduler.cancel(self._season_task)
+        self._season_task = None
+        self._season_thread = None
+
+        if self.season_frame is None:
+            return
+        for child in self.season_frame.winfo_children():
+            child.destroy()
+
+        totals = self._season_result[0] if self._season_result else {}
+        leaders = sorted(totals.values(), key=lambda entry: -entry["score"])[:SEASON_ROWS]
+
+        headings = ("Codename", "Games", "Score", "Tags", "Tagged", "FF", "Bases")
+        keys = (
+            "codename", "games", "score", "tags_given", "tags_received",
+            "friendly_fire_given", "base_captures",
+        )
+        for index, heading in enumerate(headings):
+            tk.Label(
+                self.season_frame, text=heading, width=10, anchor="w",
+                font=("Helvetica", 10, "bold"), fg="#ffcc00", bg="#0f0f23",
+            ).grid(row=0, column=index)
+        for row_index, entry in enumerate(leaders, start=1):
+            for index, key in enumerate(keys):
+                tk.Label(
+                    self.season_frame, text=str(entry[key]), width=10, anchor="w",
+                    font=("Helvetica", 10), fg="white", bg="#0f0f23",
+                ).grid(row=row_index, column=index)
+
+    def _continue(self):
+        self.destroy()
+        if self.done_callback:
+            self.done_callback()
+
+    def destroy(self):
+        # an aggregation still running just finishes unseen
+        self.scheduler.cancel(self._season_task)
+        self._season_task = None
+        self.season_frame = None
+        self.parent.unbind("<F5>")
+        if self.frame:
+            self.frame.destroy()
+            self.frame = None
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+scheduler.py - Central Frame Scheduler for Screen Timers
+
+Runs every screen's periodic and one-shot timers (game clock, score
+flash, countdown, splash, frame renders) from one chain of Tk after()
+calls:
+- deadlines are time.monotonic() values, so work done inside a task
+  never pushes later runs back; a periodic task stays on its grid
+- only one after() is pending at a time, armed for the earliest deadline,
+  and each tick runs every task that is due
+- a periodic task that fell more than one period behind runs once and
+  skips the missed periods instead of firing in a burst
+- tick lateness, work time and overruns are counted for stats()
+"""
+
+import sys
+import time
+
+from config import UI_TIMER_LATE_MS
+
+
+class ScheduledTask:
+    """One timer. Cancel it with FrameScheduler.cancel()."""
+
+    __slots__ = ("callback", "interval", "due", "name", "cancelled", "runs", "skipped")
+
+    def __init__(self, callback, interval, due, name):
+        self.callback = callback
+        self.interval = interval
+        self.due = due
+        self.name = name
+        self.cancelled = False
+        self.runs = 0
+        self.skipped = 0
+
+
+class FrameScheduler:
+    """Monotonic-deadline timers for everything shown in one Tk root."""
+
+    def __init__(self, widget, late_ms=UI_TIMER_LATE_MS):
+        self.widget = widget
+        self.late_seconds = late_ms / 1000
+
+        self._tasks = []
+        self._job = None
+        self._job_due = None
+
+        self.ticks = 0
+        self.late_ticks = 0
+        self.skipped_periods = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+        self.max_work = 0.0
+
+    def every(self, interval, callback, name=None, first_delay=None):
+        """Run `callback` every `interval` seconds, first after `first_delay` (default: interval)."""
+        if first_delay is None:
+            first_delay = interval
+        return self._add(callback, interval, first_delay, name)
+
+    def once(self, delay, callback, name=None):
+        """Run `callback` once, `delay` seconds from now."""
+        return self._add(callback, None, delay, name)
+
+    def cancel(self, task):
+        if task is None or task.cancelled:
+            return
+        task.cancelled = True
+        if task in self._tasks:
+            self._tasks.remove(task)
+        if not self._tasks and self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def stats(self):
+        return {
+            "ticks": self.ticks,
+            "late_ticks": self.late_ticks,
+            "skipped_periods": self.skipped_periods,
+            "mean_lateness_ms": self.total_lateness / self.ticks * 1000 if self.ticks else 0.0,
+            "max_lateness_ms": self.max_lateness * 1000,
+            "max_work_ms": self.max_work * 1000,
+        }
+
+    def report(self):
+        stats = self.stats()
+        return (
+            f"Timers: {stats['ticks']} ticks, {stats['late_ticks']} more than "
+            f"{self.late_seconds * 1000:.0f} ms late, {stats['skipped_periods']} skipped periods, "
+            f"lateness mean {stats['mean_lateness_ms']:.1f} / max {stats['max_lateness_ms']:.1f} ms, "
+            f"longest tick {stats['max_work_ms']:.1f} ms"
+        )
+
+    def _add(self, callback, interval, delay, name):
+        task = ScheduledTask(
+            callback, interval, time.monotonic() + delay,
+            name or getattr(callback, "__qualname__", repr(callback)),
+        )
+        self._tasks.append(task)
+        self._arm()
+        return task
+
+    def _arm(self):
+        """Keep exactly one after() pending, for the earliest deadline."""
+        if not self._tasks:
+            return
+
+        due = min(task.due for task in self._tasks)
+        if self._job is not None:
+            if self._job_due <= due:
+                return
+            self.widget.after_cancel(self._job)
+
+        # round up: Tk never fires early, so a tick always finds work due
+        delay_ms = max(0, int((due - time.monotonic()) * 1000 + 0.999))
+        self._job = self.widget.after(delay_ms, self._tick)
+        self._job_due = due
+
+    def _tick(self):
+        self._job = None
+        started = time.monotonic()
+
+        lateness = max(0.0, started - self._job_due)
+        self.ticks += 1
+        self.total_lateness += lateness
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+        if lateness > self.late_seconds:
+            self.late_ticks += 1
+
+        due_tasks = sorted(
+            (task for task in self._tasks if task.due <= started), key=lambda task: task.due
+        )
+
+        for task in due_tasks:
+            if task.cancelled:
+                continue
+
+            if task.interval is None:
+                self._tasks.remove(task)
+                task.cancelled = True
+            else:
+                task.due += task.interval
+                if task.due <= started:
+                    missed = int((started - task.due) // task.interval) + 1
+                    task.due += missed * task.interval
+                    task.skipped += missed
+                    self.skipped_periods += missed
+
+            task.runs += 1
+            try:
+                task.callback()
+            except Exception:
+                self.widget._root().report_callback_exception(*sys.exc_info())
+
+        work = time.monotonic() - started
+        if work > self.max_work:
+            self.max_work = work
+
+        self._arm()
+
+
+def get_scheduler(widget):
+    """The FrameScheduler shared by every screen in `widget`'s Tk root."""
+    root = widget._root()
+    scheduler = getattr(root, "_frame_scheduler", None)
+    if scheduler is None:
+        scheduler = root._frame_scheduler = FrameScheduler(root)
+    return scheduler
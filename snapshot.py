@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+snapshot.py - Crash-Safe Game Snapshots and Resume
+
+Lets a game that was running when the process died carry on after a
+relaunch:
+- a running game periodically saves a small JSON snapshot next to its
+  journal: every player's score and base flag, the game time, and how
+  many journal records the snapshot already covers
+- snapshots are written atomically (temp file, fsync, os.replace), so a
+  crash leaves either the previous snapshot or the new one, never a mix
+- on launch, find_resumable_game() loads the newest snapshot of an
+  unfinished game and the journal records written after it, so only that
+  tail has to be replayed through the engine
+- a game that ends normally, or whose window is closed, deletes its
+  snapshot; a snapshot that cannot be read is reported and skipped
+"""
+
+import glob
+import json
+import os
+import time
+
+import journal
+from config import JOURNAL_DIR, RESUME_MAX_AGE
+
+SNAPSHOT_VERSION = 1
+
+# journal records that are replayed into the engine on resume
+_TAG_KINDS = frozenset((
+    journal.TAG,
+    journal.FRIENDLY_FIRE,
+    journal.BASE_CAPTURE,
+    journal.BASE_HIT,
+    journal.UNKNOWN_ATTACKER,
+    journal.UNKNOWN_TARGET,
+))
+
+
+def snapshot_path(journal_path):
+    return os.path.splitext(journal_path)[0] + ".snap"
+
+
+def write_snapshot(path, state):
+    """Atomically replace the snapshot at `path` with `state` (a dict)."""
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as snapshot_file:
+        json.dump(state, snapshot_file, separators=(",", ":"))
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(temp_path, path)
+
+    # make the rename itself durable
+    try:
+        directory = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory)
+    except OSError:
+        pass
+    finally:
+        os.close(directory)
+
+
+def read_snapshot(path):
+    with open(path, "r", encoding="utf-8") as snapshot_file:
+        state = json.load(snapshot_file)
+    if state.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} has unsupported snapshot version {state.get('version')}")
+    return state
+
+
+def discard_snapshot(journal_path):
+    """Forget the snapshot of a game that ended normally."""
+    try:
+        os.remove(snapshot_path(journal_path))
+    except OSError:
+        pass
+
+
+class ResumeState:
+    """Everything needed to restart an interrupted game."""
+
+    def __init__(self, journal_path, metadata, snapshot, tail_records):
+        self.journal_path = journal_path
+        self.metadata = metadata
+        # validated here, so a damaged snapshot is rejected before the game starts
+        self.player_states = [
+            (int(equipment), int(score), bool(has_base))
+            for equipment, score, has_base in snapshot["players"]
+        ]
+
+        players = metadata["players"]
+        self.red_players = [p for p in players if p["team"] == "red"]
+        self.green_players = [p for p in players if p["team"] == "green"]
+
+        # engine messages written after the snapshot, in order
+        self.tail = []
+        for record in tail_records:
+            kind, a, b = record[1], record[4], record[5]
+            if kind in _TAG_KINDS:
+                self.tail.append(("tag", a, b))
+            elif kind == journal.CODE_RECEIVED:
+                self.tail.append(("code", a))
+
+        # game time when the process stopped: the latest record or snapshot
+        elapsed_ns = snapshot["elapsed_ns"]
+        if tail_records:
+            elapsed_ns = max(elapsed_ns, tail_records[-1][0])
+        self.seconds_remaining = max(0.0, metadata["game_seconds"] - elapsed_ns / 1e9)
+
+
+def find_resumable_game(directory=JOURNAL_DIR, max_age=RESUME_MAX_AGE):
+    """
+    Return a ResumeState for the newest unfinished game whose snapshot is
+    at most `max_age` seconds old and readable, or None. A relative
+    directory is under the application directory.
+    """
+
+    if not directory:
+        return None
+    directory = os.path.join(journal.BASE_DIR, directory)
+
+    snapshots = []
+    for path in glob.glob(os.path.join(directory, "*.snap")):
+        try:
+            snapshots.append((os.path.getmtime(path), path))
+        except OSError:
+            # removed since the glob
+            continue
+
+    for modified, path in sorted(snapshots, reverse=True):
+        if time.time() - modified > max_age:
+            return None
+
+        journal_path = os.path.splitext(path)[0] + ".jnl"
+        try:
+            snapshot = read_snapshot(path)
+            metadata, records = journal.read_journal(journal_path)
+            state = ResumeState(journal_path, metadata, snapshot, records[snapshot["records"]:])
+        except (OSError, ValueError, KeyError, TypeError, journal.JournalError) as error:
+            print(f"Skipping snapshot {path}: {error!r}")
+            continue
+
+        if state.seconds_remaining > 0:
+            return state
+
+    return None
@@ -7,8 +7,9 @@ to transition to the next screen.
 """
 
 import tkinter as tk
-from PIL import Image, ImageTk
-import os
+
+import assets
+from scheduler import get_scheduler
 
 
 class SplashScreen:
@@ -22,14 +23,15 @@ class SplashScreen:
         self.frame = tk.Frame(self.parent, bg="black")
         self.frame.pack(fill="both", expand=True)
 
-        logo_path = os.path.join(os.path.dirname(__file__), "assets", "images", "logo.jpg")
+        logo_path = assets.image_path("logo.jpg")
 
         self.parent.update_idletasks() # Update idle tasks before querying window size
         
         try:
-            image = Image.open(logo_path)
-            image = image.resize((self.parent.winfo_width(), self.parent.winfo_height()), Image.Resampling.LANCZOS)
-            self.photo = ImageTk.PhotoImage(image)
+            # resized for this window size once; later launches load it from the disk cache
+            self.photo = assets.photo(
+                logo_path, (self.parent.winfo_width(), self.parent.winfo_height()), mode="RGB"
+            )
 
             logo_label = tk.Label(self.frame, image=self.photo, bg="black")
             logo_label.pack(expand=True)
@@ -50,7 +52,7 @@ class SplashScreen:
                 font=("Helvetica", 72, "bold"), fg="red", bg="black",
             ).pack(expand=True)
 
-        self.parent.after(3000, self._end_splash)
+        get_scheduler(self.parent).once(3.0, self._end_splash, name="splash")
 
     def _end_splash(self):
         if self.frame:
@@ -0,0 +1,78 @@
+"""
+Benchmark: vectorized batch scoring vs. event-by-event scoring.
+
+Scores bursts of 1k, 10k and 100k events (same 15-vs-15 mix as
+bench_engine.py) both ways, checks that scores, leaderboards, replies,
+log lines and deltas are identical, and reports events per second.
+Needs NumPy.
+
+Run from the repository root:
+    python tools/bench_batch_scoring.py [batch_size ...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from batch_scoring import HAS_NUMPY
+from bench_engine import build_events, build_roster
+from game_engine import GameEngine
+
+
+def run(events, vector_min_batch, repeats):
+    red, green = build_roster()
+    best = None
+
+    for _ in range(repeats):
+        engine = GameEngine(red, green)
+        engine.vector_min_batch = vector_min_batch
+
+        start = time.perf_counter()
+        result = engine.process_batch(events)
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    return engine, result, best
+
+
+def leaderboard(engine):
+    return [
+        [(player.equipment, player.score, player.has_base) for player in engine.ranked_players(team)]
+        for team in ("red", "green")
+    ]
+
+
+def main():
+    if not HAS_NUMPY:
+        print("NumPy is not installed; nothing to compare.")
+        return
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+
+    print(f"{'batch':>8} {'per-event ev/s':>16} {'vectorized ev/s':>16} {'speedup':>8}")
+    for size in sizes:
+        events = build_events(size)
+        repeats = max(1, 100_000 // size)
+
+        scalar, scalar_result, scalar_time = run(events, None, repeats)
+        vector, vector_result, vector_time = run(events, 1, repeats)
+
+        assert scalar.team_totals() == vector.team_totals()
+        assert leaderboard(scalar) == leaderboard(vector)
+        assert scalar_result.replies == vector_result.replies
+        assert scalar_result.log == vector_result.log
+        assert scalar_result.deltas == vector_result.deltas
+
+        print(
+            f"{size:>8} {size / scalar_time:>16,.0f} {size / vector_time:>16,.0f} "
+            f"{scalar_time / vector_time:>7.2f}x"
+        )
+
+    print("results identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: headless GameEngine throughput.
+
+Runs a 15-vs-15 game through GameEngine.process_batch with a random mix
+of enemy tags, friendly fire, base hits and unknown IDs, and reports
+events per second. No Tk or network involved.
+
+Run from the repository root:
+    python tools/bench_engine.py [event_count] [batch_size]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from game_engine import GameEngine
+
+
+def build_roster():
+    red = [{"id": str(n), "codename": f"Red{n}", "equipment": str(n)} for n in range(1, 31, 2)]
+    green = [{"id": str(n), "codename": f"Green{n}", "equipment": str(n)} for n in range(2, 31, 2)]
+    return red, green
+
+
+def build_events(count, seed=7501):
+    rng = random.Random(seed)
+    events = []
+
+    for _ in range(count):
+        shooter = rng.randint(1, 30)
+        roll = rng.random()
+        if roll < 0.94:
+            events.append(("tag", shooter, rng.randint(1, 30)))
+        elif roll < 0.99:
+            events.append(("tag", shooter, rng.choice((43, 53))))
+        else:
+            events.append(("tag", rng.randint(31, 99), rng.randint(1, 30)))
+
+    return events
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+
+    red, green = build_roster()
+    engine = GameEngine(red, green)
+    events = build_events(count)
+
+    start = time.perf_counter()
+    for index in range(0, count, batch_size):
+        engine.process_batch(events[index:index + batch_size])
+    elapsed = time.perf_counter() - start
+
+    print(f"events:     {count} (batches of {batch_size})")
+    print(f"throughput: {count / elapsed:12,.0f} events/s  ({elapsed:.3f} s)")
+    print(f"totals:     red {engine.team_totals()[0]}, green {engine.team_totals()[1]}")
+
+
+if __name__ == "__main__":
+    main()
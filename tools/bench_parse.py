@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: text parser vs bytes-level parser for UDP payloads.
+
+Builds a corpus of game-like datagrams (tags between 30 pieces of
+equipment, base hits 43/53, start/stop codes) and times:
+- the original path: decode("ascii").strip() + _parse_message
+- the bytes path:    _parse_datagram
+
+Run from the repository root:
+    python tools/bench_parse.py [packet_count]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from udp.udp_service import _parse_cache, _parse_datagram, _parse_message
+
+
+def build_corpus(count, seed=7500):
+    rng = random.Random(seed)
+    equipment = list(range(1, 31))
+    corpus = []
+
+    for _ in range(count):
+        roll = rng.random()
+        shooter = rng.choice(equipment)
+
+        if roll < 0.90:
+            target = rng.choice(equipment)
+            corpus.append(f"{shooter}:{target}".encode("ascii"))
+        elif roll < 0.98:
+            corpus.append(f"{shooter}:{rng.choice((43, 53))}".encode("ascii"))
+        else:
+            corpus.append(str(rng.choice((202, 221))).encode("ascii"))
+
+    return corpus
+
+
+def bench_text(corpus):
+    parse = _parse_message
+    start = time.perf_counter()
+    for data in corpus:
+        parse(data.decode("ascii", errors="ignore").strip())
+    return time.perf_counter() - start
+
+
+def bench_bytes(corpus):
+    _parse_cache.clear()
+    parse = _parse_datagram
+    start = time.perf_counter()
+    for data in corpus:
+        parse(data)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    corpus = build_corpus(count)
+
+    text_seconds = bench_text(corpus)
+    bytes_seconds = bench_bytes(corpus)
+
+    print(f"packets:      {count}")
+    print(f"text parser:  {count / text_seconds:12,.0f} msg/s  ({text_seconds:.3f} s)")
+    print(f"bytes parser: {count / bytes_seconds:12,.0f} msg/s  ({bytes_seconds:.3f} s)")
+    print(f"speedup:      {text_seconds / bytes_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: season statistics over many recorded games.
+
+Plays N synthetic games (same 15-vs-15 mix as bench_engine.py) through the
+game engine, writes each one as a journal in a temporary directory, then
+aggregates the whole season with analytics.py, once with the NumPy path
+and once with the pure-Python path. Checks that both agree with each
+other and with the engine's final scores, and reports games per second.
+
+Run from the repository root:
+    python tools/bench_season_stats.py [games] [events_per_game]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import analytics
+import journal
+from bench_engine import build_events, build_roster
+from game_engine import GameEngine
+
+GAME_SECONDS = 360
+
+
+class SyntheticJournal:
+    """Stands in for journal.GameJournal, spreading records over a game."""
+
+    def __init__(self, event_count):
+        self.step_ns = GAME_SECONDS * 1_000_000_000 // max(1, event_count)
+        self.elapsed_ns = 0
+        self.chunks = []
+
+    def record(self, kind, a=0, b=0, team=-1, points=0):
+        self.chunks.append(journal.RECORD.pack(self.elapsed_ns, kind, team, points, a, b))
+
+    def advance(self):
+        self.elapsed_ns += self.step_ns
+
+
+def write_game(path, events):
+    red, green = build_roster()
+    engine = GameEngine(red, green)
+    recorder = engine.journal = SyntheticJournal(len(events))
+    for event in events:
+        engine.process(event)
+        recorder.advance()
+
+    metadata = {
+        "version": 1,
+        "started": 0,
+        "game_seconds": GAME_SECONDS,
+        "players": [
+            {
+                "id": player.id,
+                "codename": player.codename,
+                "equipment": player.equipment,
+                "team": player.team_name,
+            }
+            for player in engine.roster
+        ],
+    }
+    header = json.dumps(metadata).encode("utf-8")
+    with open(path, "wb") as journal_file:
+        journal_file.write(journal.MAGIC + journal._LENGTH.pack(len(header)) + header)
+        journal_file.write(b"".join(recorder.chunks))
+
+    return {str(player.id): player.score for player in engine.roster}
+
+
+def aggregate(paths, use_numpy):
+    saved = analytics.HAS_NUMPY
+    analytics.HAS_NUMPY = use_numpy
+    try:
+        start = time.perf_counter()
+        totals = analytics.aggregate_games(paths)
+        return totals, time.perf_counter() - start
+    finally:
+        analytics.HAS_NUMPY = saved
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    events_per_game = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    with tempfile.TemporaryDirectory() as directory:
+        expected = {}
+        paths = []
+        for game in range(games):
+            path = os.path.join(directory, f"game-{game:05d}.jnl")
+            scores = write_game(path, build_events(events_per_game, seed=7501 + game))
+            for player_id, score in scores.items():
+                expected[player_id] = expected.get(player_id, 0) + score
+            paths.append(path)
+
+        modes = [("python", False)]
+        if analytics.HAS_NUMPY:
+            modes.append(("numpy", True))
+
+        results = {}
+        for name, use_numpy in modes:
+            totals, elapsed = aggregate(paths, use_numpy)
+            results[name] = totals
+            scores = {player_id: entry["score"] for player_id, entry in totals.items()}
+            status = "ok" if scores == expected else "MISMATCH with engine scores"
+            print(
+                f"{name:>7}: {games} games x {events_per_game} events in {elapsed:.2f} s "
+                f"({games / elapsed:,.0f} games/s) {status}"
+            )
+
+        if len(results) == 2:
+            same = results["python"] == results["numpy"]
+            print("python and numpy totals " + ("identical" if same else "DIFFER"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Replay a packet capture (see udp/capture.py) against a running game.
+
+Sends the recorded 7501 traffic back over UDP with the original timing,
+scaled by --speed, or as fast as possible with --asap.
+
+Run from the repository root:
+    python tools/replay_capture.py game.cap --speed 10
+    python tools/replay_capture.py game.cap --asap --host 192.168.1.20
+"""
+
+import argparse
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from config import UDP_RECEIVE_PORT
+from udp.capture import INBOUND, replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Photon packet capture over UDP")
+    parser.add_argument("capture", help="capture file written by udp.capture")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed multiplier")
+    parser.add_argument("--asap", action="store_true", help="ignore timing, send as fast as possible")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=UDP_RECEIVE_PORT)
+    args = parser.parse_args()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    address = (args.host, args.port)
+    speed = 0 if args.asap else args.speed
+
+    started = time.perf_counter()
+    count = replay(args.capture, lambda payload: sock.sendto(payload, address), speed, INBOUND)
+    elapsed = time.perf_counter() - started
+
+    print(f"Replayed {count} packets to {args.host}:{args.port} in {elapsed:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+asyncio UDP transport for the Laser Tag system.
+
+Responsibilities:
+- Receive tag events on UDP port 7501: each time the socket is readable,
+  drain every queued datagram into one batch (loop.add_reader), as the
+  thread backend does; loops without add_reader (Windows proactor) use a
+  datagram endpoint and coalesce what arrives within one loop iteration
+- Broadcast integer messages on UDP port 7500 from the same event loop
+- Expose the same start / stop / send_message / set_message_handler surface
+  as udp_service, so either backend can be selected at startup
+
+Every AsyncUdpService created without an explicit loop shares one event
+loop running on a single background thread, so several sockets (and
+anything else scheduled on that loop) cost one thread in total. The
+thread is stopped when the last service using it stops.
+"""
+
+import asyncio
+import socket
+import threading
+import time
+from typing import Callable, List, Optional
+
+from config import UDP_BROADCAST_ADDRESS, UDP_BROADCAST_PORT, UDP_RECEIVE_PORT
+from udp import capture, packet_log
+from udp.pubsub import ReceivedBatch
+from udp.udp_service import (
+    ParsedMsg,
+    _decode_datagram,
+    _drain_socket,
+    _new_buffer_pool,
+    apply_buffer_sizes,
+)
+
+_shared_loop: Optional[asyncio.AbstractEventLoop] = None
+_shared_loop_thread: Optional[threading.Thread] = None
+_shared_loop_lock = threading.Lock()
+# started AsyncUdpServices running on the shared loop
+_shared_loop_users = 0
+
+
+def get_shared_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the process-wide UDP event loop, starting its thread if needed.
+    """
+
+    global _shared_loop, _shared_loop_thread
+
+    with _shared_loop_lock:
+        if _shared_loop is None or _shared_loop.is_closed():
+            _shared_loop = asyncio.new_event_loop()
+            _shared_loop_thread = threading.Thread(
+                target=_run_shared_loop, args=(_shared_loop,), name="udp-asyncio", daemon=True
+            )
+            _shared_loop_thread.start()
+
+        return _shared_loop
+
+
+def _run_shared_loop(loop: asyncio.AbstractEventLoop) -> None:
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
+def shutdown_shared_loop() -> None:
+    """
+    Stop the shared event loop and wait for its thread to exit.
+    """
+
+    global _shared_loop, _shared_loop_thread, _shared_loop_users
+
+    with _shared_loop_lock:
+        loop, thread = _shared_loop, _shared_loop_thread
+        _shared_loop = None
+        _shared_loop_thread = None
+        _shared_loop_users = 0
+
+    if loop is None:
+        return
+
+    # the loop thread closes the loop once run_forever returns
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None and thread is not threading.current_thread():
+        thread.join()
+
+
+def _acquire_shared_loop() -> asyncio.AbstractEventLoop:
+    global _shared_loop_users
+
+    loop = get_shared_loop()
+    with _shared_loop_lock:
+        _shared_loop_users += 1
+    return loop
+
+
+def _release_shared_loop() -> None:
+    global _shared_loop_users
+
+    with _shared_loop_lock:
+        _shared_loop_users = max(0, _shared_loop_users - 1)
+        idle = _shared_loop_users == 0
+    if idle:
+        shutdown_shared_loop()
+
+
+class _ReceiveProtocol(asyncio.DatagramProtocol):
+    """
+    Forwards each received datagram to the owning service. Only used on
+    loops without add_reader.
+    """
+
+    def __init__(self, service: "AsyncUdpService"):
+        self.service = service
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.service._on_datagram(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        packet_log.log("error", "Receive error: {error}", error=exc)
+
+
+class AsyncUdpService:
+    """
+    UDP send/receive on an asyncio event loop.
+
+    start() and stop() may be called from any thread; they block until the
+    endpoints are open or closed on the service's loop. Inside a coroutine
+    running on that loop, use open() and close() instead.
+    """
+
+    def __init__(
+        self,
+        receive_port: int = UDP_RECEIVE_PORT,
+        broadcast_port: int = UDP_BROADCAST_PORT,
+        broadcast_address: str = UDP_BROADCAST_ADDRESS,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        bind_address: str = "0.0.0.0",
+    ):
+        self.receive_port = receive_port
+        self.broadcast_port = broadcast_port
+        self.broadcast_address = broadcast_address
+        self.bind_address = bind_address
+        self.loop = loop
+        # True while this service holds a reference on the shared loop
+        self._uses_shared_loop = False
+
+        self._send_transport: Optional[asyncio.DatagramTransport] = None
+        # receive socket drained from an add_reader callback...
+        self._recv_sock: Optional[socket.socket] = None
+        self._recv_views: List[memoryview] = []
+        # ...or, without add_reader, a datagram endpoint
+        self._recv_transport: Optional[asyncio.DatagramTransport] = None
+        self._pending: Optional[ReceivedBatch] = None
+
+        # PacketRecorder set by the owning UdpService while capturing
+        self.recorder = None
+
+        self._message_handler: Optional[Callable[[ParsedMsg], None]] = None
+        self._batch_handler: Optional[Callable[[List[ParsedMsg]], None]] = None
+
+    def start(self) -> None:
+        """
+        Open the send and receive endpoints on the service's event loop.
+        """
+
+        if self.loop is None or (self._uses_shared_loop and self.loop.is_closed()):
+            self.loop = _acquire_shared_loop()
+            self._uses_shared_loop = True
+
+        asyncio.run_coroutine_threadsafe(self.open(), self.loop).result()
+
+    def stop(self) -> None:
+        """
+        Close both endpoints. Returns as soon as the loop has closed them.
+        The shared loop's thread is stopped once no started service uses it.
+        """
+
+        if self.loop is None or self.loop.is_closed():
+            return
+
+        if self._on_loop_thread():
+            self._close_transports()
+        else:
+            asyncio.run_coroutine_threadsafe(self.close(), self.loop).result()
+
+        if self._uses_shared_loop:
+            self._uses_shared_loop = False
+            self.loop = None
+            _release_shared_loop()
+
+    async def open(self) -> None:
+        """Coroutine form of start(), for callers already on the loop."""
+
+        loop = asyncio.get_running_loop()
+        self.loop = loop
+
+        if self._send_transport is None:
+            self._send_transport, _ = await loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol, family=socket.AF_INET
+            )
+            apply_buffer_sizes(self._send_transport.get_extra_info("socket"))
+
+        if not self.is_running():
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                apply_buffer_sizes(sock)
+                sock.bind((self.bind_address, self.receive_port))
+                sock.setblocking(False)
+            except OSError:
+                sock.close()
+                raise
+
+            if not self._recv_views:
+                self._recv_views = _new_buffer_pool()
+            try:
+                loop.add_reader(sock.fileno(), self._on_readable)
+                self._recv_sock = sock
+            except NotImplementedError:
+                self._recv_transport, _ = await loop.create_datagram_endpoint(
+                    lambda: _ReceiveProtocol(self), sock=sock
+                )
+
+            packet_log.log(
+                "service", "Listening on {address}:{port} (asyncio)",
+                address=self.bind_address, port=self.receive_port,
+            )
+
+    async def close(self) -> None:
+        """Coroutine form of stop()."""
+        self._close_transports()
+
+    def is_running(self) -> bool:
+        return self._recv_sock is not None or self._recv_transport is not None
+
+    def get_broadcast_address(self) -> str:
+        return self.broadcast_address
+
+    def set_broadcast_address(self, address: str) -> None:
+        self.broadcast_address = address.strip()
+
+    def set_message_handler(self, handler: Optional[Callable[[ParsedMsg], None]]) -> None:
+        """Register a callback that receives parsed UDP messages."""
+        self._message_handler = handler
+
+    def set_batch_message_handler(
+        self, handler: Optional[Callable[[List[ParsedMsg]], None]]
+    ) -> None:
+        """
+        Register a callback that receives parsed messages as a list.
+        When set, it is used instead of the per-message handler.
+        """
+        self._batch_handler = handler
+
+    def send_message(self, value: int) -> None:
+        """
+        Broadcast a single integer message. Never blocks the caller:
+        from other threads the send is handed to the event loop.
+        """
+
+        if self._send_transport is None:
+            self.start()
+
+        message = str(int(value)).encode("ascii")
+
+        if self._on_loop_thread():
+            self._send(message)
+        else:
+            self.loop.call_soon_threadsafe(self._send, message)
+
+    def _send(self, message: bytes) -> None:
+        if self._send_transport is None:
+            return
+        self._send_transport.sendto(message, (self.broadcast_address, self.broadcast_port))
+
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(capture.OUTBOUND, message)
+
+    def _on_readable(self) -> None:
+        """Loop callback: drain everything queued on the socket as one batch."""
+
+        sock = self._recv_sock
+        if sock is None:
+            return
+        try:
+            batch = _drain_socket(sock, self._recv_views, self.recorder)
+        except OSError as error:
+            packet_log.log("error", "Receive error: {error}", error=error)
+            return
+
+        if batch:
+            self._dispatch(batch)
+
+    def _on_datagram(self, data: bytes, addr) -> None:
+        """Endpoint fallback: collect the datagrams of one loop iteration."""
+
+        received_ns = time.monotonic_ns()
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(capture.INBOUND, data)
+
+        parsed = _decode_datagram(data, addr)
+        if parsed is None:
+            return
+
+        if self._pending is None:
+            self._pending = ReceivedBatch((), received_ns)
+            self.loop.call_soon(self._flush_pending)
+        self._pending.append(parsed)
+
+    def _flush_pending(self) -> None:
+        batch = self._pending
+        self._pending = None
+        if batch:
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: ReceivedBatch) -> None:
+        try:
+            if self._batch_handler is not None:
+                self._batch_handler(batch)
+            elif self._message_handler is not None:
+                for parsed in batch:
+                    self._message_handler(parsed)
+        except Exception as error:
+            packet_log.log("error", "Handler error: {error}", error=error)
+
+    def _close_transports(self) -> None:
+        if self._recv_sock is not None:
+            self.loop.remove_reader(self._recv_sock.fileno())
+            self._recv_sock.close()
+            self._recv_sock = None
+
+        if self._recv_transport is not None:
+            self._recv_transport.close()
+            self._recv_transport = None
+
+        if self._send_transport is not None:
+            self._send_transport.close()
+            self._send_transport = None
+
+    def _on_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
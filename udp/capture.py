@@ -0,0 +1,187 @@
+"""
+Raw packet capture and replay for the Laser Tag system.
+
+Responsibilities:
+- Record every datagram received on 7501 and sent on 7500, with monotonic
+  nanosecond timestamps, into a compact binary capture file
+- Read capture files back
+- Replay a capture into any sink at 1x, Nx or as fast as possible
+
+File layout:
+    8-byte magic b"PHOTCAP1"
+    then one record per datagram:
+        uint64 timestamp_ns  (time.monotonic_ns() at capture)
+        uint8  direction     (0 = received on 7501, 1 = sent on 7500,
+                              2 = start of a recording session)
+        uint16 length
+        length bytes of payload
+All integers are little-endian.
+
+Recording into an existing capture appends to it, so restarting the
+service never loses an earlier session. Every recorder starts with an
+empty session record: monotonic clocks restart with the process, so
+timestamps are only comparable within one session.
+"""
+
+import os
+import struct
+import threading
+import time
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple
+
+MAGIC = b"PHOTCAP1"
+INBOUND = 0
+OUTBOUND = 1
+SESSION = 2
+
+_RECORD_HEADER = struct.Struct("<QBH")
+
+
+class CaptureError(Exception):
+    """Raised when a file is not a valid capture."""
+
+
+class PacketRecorder:
+    """
+    Appends datagrams to a capture file. Safe to call from any thread.
+    An existing capture is continued after its last complete record.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records = 0
+
+        end = _complete_length(path)
+        if end is None:
+            self._file: Optional[BinaryIO] = open(path, "wb", buffering=64 * 1024)
+            self._file.write(MAGIC)
+        else:
+            # cut off a record torn by a crash, then append after it
+            with open(path, "r+b") as capture_file:
+                capture_file.truncate(end)
+            self._file = open(path, "ab", buffering=64 * 1024)
+        self._file.write(_RECORD_HEADER.pack(time.monotonic_ns(), SESSION, 0))
+        self._lock = threading.Lock()
+
+    def record(self, direction: int, payload, timestamp: Optional[int] = None) -> None:
+        """
+        Append one datagram. `timestamp` defaults to now; receive workers in
+        other processes pass the time they read the datagram.
+        """
+
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+        payload = bytes(payload)
+
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_RECORD_HEADER.pack(timestamp, direction, len(payload)))
+            self._file.write(payload)
+            self.records += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+
+
+def _complete_length(path: str) -> Optional[int]:
+    """
+    Return the length of an existing capture up to its last complete
+    record, or None if there is no capture at `path` yet.
+    """
+
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        return None
+    if size == 0:
+        return None
+
+    header_size = _RECORD_HEADER.size
+    with open(path, "rb") as capture_file:
+        if capture_file.read(len(MAGIC)) != MAGIC:
+            raise CaptureError(f"{path} exists and is not a packet capture")
+
+        end = len(MAGIC)
+        while end + header_size <= size:
+            header = capture_file.read(header_size)
+            _, _, length = _RECORD_HEADER.unpack(header)
+            if end + header_size + length > size:
+                break
+            end += header_size + length
+            capture_file.seek(end)
+
+    return end
+
+
+def read_capture(path: str) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Yield (timestamp_ns, direction, payload) for each record in a capture,
+    including the empty SESSION records.
+    """
+
+    with open(path, "rb") as capture_file:
+        if capture_file.read(len(MAGIC)) != MAGIC:
+            raise CaptureError(f"{path} is not a packet capture")
+
+        header_size = _RECORD_HEADER.size
+        while True:
+            header = capture_file.read(header_size)
+            if not header:
+                return
+            if len(header) < header_size:
+                raise CaptureError(f"{path} ends with a truncated record")
+
+            timestamp, direction, length = _RECORD_HEADER.unpack(header)
+            payload = capture_file.read(length)
+            if len(payload) < length:
+                raise CaptureError(f"{path} ends with a truncated record")
+
+            yield timestamp, direction, payload
+
+
+def replay(
+    path: str,
+    sink: Callable[[bytes], None],
+    speed: float = 1.0,
+    direction: int = INBOUND,
+) -> int:
+    """
+    Feed the payloads of one direction of a capture into `sink`, keeping the
+    recorded spacing divided by `speed`. A speed of 0 replays as fast as
+    possible. Returns the number of payloads replayed.
+
+    Deadlines are measured from the first record of each recording session,
+    so sleep overshoot never accumulates across records and the time
+    between two appended sessions is not replayed.
+    """
+
+    first_timestamp = None
+    started = 0
+    count = 0
+
+    for timestamp, record_direction, payload in read_capture(path):
+        if record_direction == SESSION:
+            first_timestamp = None
+            continue
+        if record_direction != direction:
+            continue
+
+        if first_timestamp is None:
+            first_timestamp = timestamp
+            started = time.monotonic_ns()
+
+        if speed > 0:
+            due = started + (timestamp - first_timestamp) / speed
+            delay = (due - time.monotonic_ns()) / 1e9
+            if delay > 0:
+                time.sleep(delay)
+
+        sink(payload)
+        count += 1
+
+    return count
@@ -0,0 +1,106 @@
+"""
+Kernel receive-drop monitoring for the UDP receive port.
+
+Responsibilities:
+- Read the kernel's per-socket drop counter for a local UDP port
+  from /proc/net/udp and /proc/net/udp6 (Linux)
+- Sample it in the background while the service runs
+- Expose the number of datagrams dropped since monitoring started and log a
+  warning whenever it grows, so lost packets can be told apart from misses
+
+On platforms without /proc the monitor stays idle and reports no drops.
+"""
+
+import threading
+from typing import Optional
+
+from config import UDP_DROP_MONITOR_INTERVAL
+from udp import packet_log
+
+_PROC_FILES = ("/proc/net/udp", "/proc/net/udp6")
+
+
+def read_udp_drops(port: int) -> Optional[int]:
+    """
+    Return the total kernel drop count of all sockets bound to the local
+    UDP port, or None if the counters cannot be read.
+    """
+
+    port_suffix = f":{port:04X}"
+    total = 0
+    found = False
+
+    for path in _PROC_FILES:
+        try:
+            with open(path) as proc_file:
+                lines = proc_file.readlines()[1:]
+        except OSError:
+            continue
+
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 13 or not fields[1].endswith(port_suffix):
+                continue
+            try:
+                total += int(fields[-1])
+                found = True
+            except ValueError:
+                continue
+
+    return total if found else None
+
+
+class KernelDropMonitor:
+    """Background sampler of the receive port's kernel drop counter."""
+
+    def __init__(self, port: int, interval: float = UDP_DROP_MONITOR_INTERVAL):
+        self.port = port
+        self.interval = interval
+        self.drops = 0
+
+        self._baseline = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        # the receive socket is usually bound after this, so no counter
+        # is a zero baseline
+        self._baseline = read_udp_drops(self.port) or 0
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._monitor_loop, name="udp-drop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(self.interval + 1.0)
+            self._thread = None
+
+    def sample(self) -> int:
+        """Read the counter now and return drops since monitoring started."""
+
+        current = read_udp_drops(self.port)
+        if current is None:
+            return self.drops
+
+        if current < self._baseline:
+            # the socket was rebound and its counter restarted
+            self._baseline = 0
+
+        drops = current - self._baseline
+        if drops > self.drops:
+            packet_log.log(
+                "warning", "Kernel dropped {new} datagrams on port {port} ({total} total)",
+                new=drops - self.drops, port=self.port, total=drops,
+            )
+        self.drops = drops
+        return drops
+
+    def _monitor_loop(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.sample()
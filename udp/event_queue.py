@@ -0,0 +1,141 @@
+"""
+Bounded hand-off queue between the UDP receive side and the game screen.
+
+Responsibilities:
+- Hold parsed messages until the Tk thread drains them
+- Never grow past a fixed size, whatever the consumer is doing
+- Apply an overflow policy when full:
+    drop_oldest  - discard the oldest pending events to make room
+    drop_newest  - discard the incoming events
+    collapse     - first merge duplicate pending events, then drop newest
+- Count drops, collapsed duplicates and the high-water mark
+- Remember when the oldest pending batch was received, for latency stats
+
+The producer puts whole batches and the consumer drains everything at once,
+so the lock is taken once per batch rather than once per event.
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import UDP_EVENT_QUEUE_POLICY, UDP_EVENT_QUEUE_SIZE
+
+POLICIES = ("drop_oldest", "drop_newest", "collapse")
+
+
+class EventQueue:
+    """Bounded FIFO of parsed messages with a configurable overflow policy."""
+
+    def __init__(self, maxsize: int = UDP_EVENT_QUEUE_SIZE, policy: str = UDP_EVENT_QUEUE_POLICY):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}, expected one of {POLICIES}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.policy = policy
+
+        self._events = deque()
+        self._lock = threading.Lock()
+        self._oldest_received_ns: Optional[int] = None
+
+        self.received = 0
+        self.dropped = 0
+        self.collapsed = 0
+        self.high_water = 0
+
+    def put_many(self, events: Iterable, received_ns: Optional[int] = None) -> None:
+        """
+        Add a batch of events, applying the overflow policy if needed.
+        `received_ns` is the batch's time.monotonic_ns() receive stamp.
+        """
+
+        events = list(events)
+
+        with self._lock:
+            if received_ns is not None and (
+                self._oldest_received_ns is None or received_ns < self._oldest_received_ns
+            ):
+                self._oldest_received_ns = received_ns
+
+            self.received += len(events)
+            pending = self._events
+            free = self.maxsize - len(pending)
+
+            if len(events) > free:
+                if self.policy == "drop_oldest":
+                    self._drop_oldest(events)
+                elif self.policy == "collapse":
+                    self._collapse(events)
+                else:
+                    self._drop_newest(events, free)
+            else:
+                pending.extend(events)
+
+            size = len(self._events)
+            if size > self.high_water:
+                self.high_water = size
+
+    def drain(self) -> List:
+        """Remove and return every pending event, oldest first."""
+        return self.drain_timed()[0]
+
+    def drain_timed(self) -> Tuple[List, Optional[int]]:
+        """
+        Like drain(), also returning the receive stamp of the oldest batch
+        drained (None if no batch carried one).
+        """
+
+        with self._lock:
+            received_ns = self._oldest_received_ns
+            self._oldest_received_ns = None
+            if not self._events:
+                return [], None
+            events = self._events
+            self._events = deque()
+
+        return list(events), received_ns
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._events),
+            "received": self.received,
+            "dropped": self.dropped,
+            "collapsed": self.collapsed,
+            "high_water": self.high_water,
+        }
+
+    def _drop_oldest(self, events: List) -> None:
+        pending = self._events
+
+        if len(events) >= self.maxsize:
+            self.dropped += len(pending) + len(events) - self.maxsize
+            pending.clear()
+            pending.extend(events[-self.maxsize:])
+            return
+
+        overflow = len(pending) + len(events) - self.maxsize
+        for _ in range(overflow):
+            pending.popleft()
+        self.dropped += overflow
+        pending.extend(events)
+
+    def _drop_newest(self, events: List, free: int) -> None:
+        if free > 0:
+            self._events.extend(events[:free])
+        self.dropped += len(events) - max(free, 0)
+
+    def _collapse(self, events: List) -> None:
+        # keep the first occurrence of each distinct event, in order
+        merged = list(dict.fromkeys(list(self._events) + events))
+        self.collapsed += len(self._events) + len(events) - len(merged)
+
+        if len(merged) > self.maxsize:
+            self.dropped += len(merged) - self.maxsize
+            merged = merged[:self.maxsize]
+
+        self._events = deque(merged)
@@ -0,0 +1,206 @@
+"""
+Asynchronous, rate-limited logging for the UDP hot path.
+
+Responsibilities:
+- Accept log records from any thread without doing I/O on that thread
+- Keep pending records in a bounded in-memory ring buffer
+- Sample noisy categories ("log 1 in N tag packets")
+- Write records from a background thread as plain text or JSON lines
+
+Records are formatted by the writer thread, so callers pass a
+str.format template plus raw field values instead of a finished string:
+
+    packet_log.log("tag", "From {addr}: {parsed}", addr=addr, parsed=parsed)
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, TextIO
+
+from config import UDP_LOG_JSON, UDP_LOG_RING_SIZE, UDP_LOG_SAMPLE_RATES
+
+
+class PacketLog:
+    """Ring-buffered log with a background writer and per-category sampling."""
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        ring_size: int = UDP_LOG_RING_SIZE,
+        json_lines: bool = UDP_LOG_JSON,
+        sample_rates: Optional[Dict[str, int]] = None,
+        flush_interval: float = 0.05,
+    ):
+        self.stream = stream
+        self.json_lines = json_lines
+        self.flush_interval = flush_interval
+
+        self._ring = deque(maxlen=ring_size)
+        self._sample_rates: Dict[str, int] = dict(UDP_LOG_SAMPLE_RATES)
+        if sample_rates:
+            self._sample_rates.update(sample_rates)
+        self._seen: Dict[str, int] = {}
+
+        self.written = 0
+        self.sampled_out = 0
+        self.overwritten = 0
+
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def set_sample_rate(self, category: str, every: int) -> None:
+        """
+        Log 1 in `every` records of a category. 1 logs everything,
+        0 silences the category.
+        """
+        self._sample_rates[category] = max(0, int(every))
+
+    def log(self, category: str, message: str, **fields) -> None:
+        """
+        Queue a record for the writer thread. Never blocks on I/O.
+        """
+
+        every = self._sample_rates.get(category, 1)
+        if every != 1:
+            seen = self._seen.get(category, 0)
+            self._seen[category] = seen + 1
+            if every == 0 or seen % every:
+                self.sampled_out += 1
+                return
+
+        ring = self._ring
+        if len(ring) == ring.maxlen:
+            self.overwritten += 1
+        ring.append((time.time(), category, message, fields))
+
+        if self._writer is None:
+            self._start_writer()
+
+    def flush(self, timeout: float = 1.0) -> None:
+        """
+        Ask the writer to drain the ring now and wait briefly for it.
+        """
+
+        if self._writer is None:
+            return
+
+        self._wake.set()
+        deadline = time.monotonic() + timeout
+        while self._ring and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def stop(self) -> None:
+        """Write out pending records and stop the writer thread."""
+
+        with self._writer_lock:
+            writer = self._writer
+            self._writer = None
+
+        if writer is None:
+            return
+
+        self._stop.set()
+        self._wake.set()
+        writer.join()
+        self._stop.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._ring),
+            "written": self.written,
+            "sampled_out": self.sampled_out,
+            "overwritten": self.overwritten,
+        }
+
+    def _start_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(
+                target=self._write_loop, name="udp-log-writer", daemon=True
+            )
+            self._writer.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+
+            if self._stop.is_set():
+                self._drain()
+                return
+
+    def _drain(self) -> None:
+        ring = self._ring
+        if not ring:
+            return
+
+        stream = self.stream or sys.stdout
+        lines = []
+
+        while ring:
+            try:
+                record = ring.popleft()
+            except IndexError:
+                break
+            lines.append(self._format(record))
+
+        try:
+            stream.write("".join(lines))
+            stream.flush()
+        except (OSError, ValueError):
+            return
+
+        self.written += len(lines)
+
+    def _format(self, record) -> str:
+        timestamp, category, message, fields = record
+
+        try:
+            text = message.format(**fields)
+        except (KeyError, IndexError, ValueError):
+            text = message
+
+        if not self.json_lines:
+            return f"[UDP] {text}\n"
+
+        entry = {"ts": round(timestamp, 6), "category": category, "message": text}
+        entry.update(fields)
+        return json.dumps(entry, default=repr) + "\n"
+
+
+_default_log = PacketLog()
+
+
+def get_packet_log() -> PacketLog:
+    """Return the process-wide packet log used by the UDP services."""
+    return _default_log
+
+
+def log(category: str, message: str, **fields) -> None:
+    """Queue a record on the process-wide packet log."""
+    _default_log.log(category, message, **fields)
+
+
+def configure(
+    json_lines: Optional[bool] = None,
+    sample_rates: Optional[Dict[str, int]] = None,
+    stream: Optional[TextIO] = None,
+) -> None:
+    """Adjust output format, sampling and destination of the packet log."""
+
+    if json_lines is not None:
+        _default_log.json_lines = json_lines
+
+    if sample_rates:
+        for category, every in sample_rates.items():
+            _default_log.set_sample_rate(category, every)
+
+    if stream is not None:
+        _default_log.stream = stream
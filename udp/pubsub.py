@@ -0,0 +1,157 @@
+"""
+Publish/subscribe dispatch of parsed UDP messages.
+
+Responsibilities:
+- Let any number of consumers (game screen, recorder, stats, spectator feed)
+  subscribe to received messages
+- Filter per subscriber by message type ("tag", "code")
+- Deliver either synchronously on the receive thread or on the subscriber's
+  own executor, so a slow consumer never delays the others
+- Isolate subscriber errors from the receive path
+- Carry the batch's receive timestamp through to subscribers
+"""
+
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, FrozenSet, Iterable, List, Optional, Tuple
+
+from udp import packet_log
+
+MESSAGE_KINDS = ("tag", "code")
+MODES = ("sync", "executor")
+
+
+class ReceivedBatch(list):
+    """
+    A batch of parsed messages plus time.monotonic_ns() at which its first
+    datagram was read from the socket, for latency measurement downstream.
+    """
+
+    __slots__ = ("received_ns",)
+
+    def __init__(self, messages: Iterable = (), received_ns: Optional[int] = None):
+        super().__init__(messages)
+        self.received_ns = received_ns
+
+
+class Subscription:
+    """One subscriber: its callback, filter and delivery mode."""
+
+    def __init__(
+        self,
+        callback: Callable,
+        kinds: Iterable[str] = MESSAGE_KINDS,
+        mode: str = "sync",
+        batch: bool = True,
+        executor: Optional[Executor] = None,
+        name: Optional[str] = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown delivery mode {mode!r}, expected one of {MODES}")
+        if mode == "sync" and executor is not None:
+            raise ValueError('An executor can only be used with mode="executor"')
+
+        self.callback = callback
+        self.kinds: FrozenSet[str] = frozenset(kinds)
+        self.mode = mode
+        self.batch = batch
+        self.name = name or getattr(callback, "__qualname__", repr(callback))
+
+        self._wants_all = self.kinds.issuperset(MESSAGE_KINDS)
+        self._owns_executor = False
+        self._executor = executor
+        self._closed = False
+
+        if mode == "executor" and executor is None:
+            # one worker per subscriber keeps its messages in order
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"udp-sub-{self.name}"
+            )
+            self._owns_executor = True
+
+        self.delivered = 0
+        self.errors = 0
+
+    def publish(self, messages: List) -> None:
+        """Deliver the messages this subscriber is interested in."""
+
+        if not self._wants_all:
+            messages = ReceivedBatch(
+                (message for message in messages if message[0] in self.kinds),
+                getattr(messages, "received_ns", None),
+            )
+        if not messages or self._closed:
+            return
+
+        if self.mode == "sync":
+            self._deliver(messages)
+            return
+
+        # close() may run on another thread at any point: read the executor
+        # once, and drop what arrives after the subscription was closed
+        executor = self._executor
+        if executor is None:
+            return
+        try:
+            executor.submit(self._deliver, messages)
+        except RuntimeError:
+            # shut down between the check and the submit
+            pass
+
+    def close(self) -> None:
+        self._closed = True
+        executor = self._executor
+        self._executor = None
+        if self._owns_executor and executor is not None:
+            executor.shutdown(wait=False)
+
+    def _deliver(self, messages: List) -> None:
+        try:
+            if self.batch:
+                self.callback(messages)
+            else:
+                for message in messages:
+                    self.callback(message)
+            self.delivered += len(messages)
+        except Exception as error:
+            self.errors += 1
+            packet_log.log(
+                "error", "Subscriber {name} error: {error}", name=self.name, error=error
+            )
+
+
+class SubscriberRegistry:
+    """
+    Set of subscriptions. Publishing iterates an immutable snapshot, so
+    subscribers can be added or removed from any thread without locking
+    the receive path.
+    """
+
+    def __init__(self):
+        self._subscriptions: Tuple[Subscription, ...] = ()
+        self._lock = threading.Lock()
+
+    def add(self, subscription: Subscription) -> Subscription:
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+        return subscription
+
+    def remove(self, subscription: Optional[Subscription]) -> None:
+        if subscription is None:
+            return
+
+        with self._lock:
+            self._subscriptions = tuple(
+                existing for existing in self._subscriptions if existing is not subscription
+            )
+        subscription.close()
+
+    def publish(self, messages: List) -> None:
+        for subscription in self._subscriptions:
+            subscription.publish(messages)
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def __iter__(self):
+        return iter(self._subscriptions)
@@ -0,0 +1,131 @@
+"""
+Outbound packet queue for the Laser Tag system.
+
+Responsibilities:
+- Accept outgoing messages from any thread (the Tk thread in particular)
+  without ever touching the socket on the caller's thread
+- Send them from one dedicated worker, draining each burst in one wakeup
+- Optionally pace consecutive sends
+- Count sends, errors, drops and enqueue-to-send latency
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from config import UDP_SEND_PACING, UDP_SEND_QUEUE_SIZE
+from udp import packet_log
+
+
+class PacketSender:
+    """Bounded send queue drained by a single sender thread."""
+
+    def __init__(
+        self,
+        transmit: Callable[[bytes], None],
+        max_pending: int = UDP_SEND_QUEUE_SIZE,
+        pacing: float = UDP_SEND_PACING,
+        name: str = "udp-sender",
+    ):
+        self.transmit = transmit
+        self.max_pending = max_pending
+        self.pacing = pacing
+        self.name = name
+
+        self._pending = deque()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.sent = 0
+        self.errors = 0
+        self.dropped = 0
+        self.bursts = 0
+        self.last_error: Optional[str] = None
+        self._latency_total_ns = 0
+        self._latency_max_ns = 0
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopping = False
+        self._thread = threading.Thread(target=self._send_loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Send whatever is still queued, then stop the worker.
+        """
+
+        thread = self._thread
+        if thread is None:
+            return
+
+        self._stopping = True
+        self._wake.set()
+        thread.join(timeout)
+        self._thread = None
+
+    def submit(self, message: bytes) -> bool:
+        """
+        Queue a message for sending. Never blocks; returns False and counts
+        a drop when the queue is full.
+        """
+
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return False
+
+        self._pending.append((time.monotonic_ns(), message))
+        self._wake.set()
+
+        if self._thread is None:
+            self.start()
+
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        sent = self.sent
+        return {
+            "pending": len(self._pending),
+            "sent": sent,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "bursts": self.bursts,
+            "latency_avg_ms": (self._latency_total_ns / sent / 1e6) if sent else 0.0,
+            "latency_max_ms": self._latency_max_ns / 1e6,
+        }
+
+    def _send_loop(self) -> None:
+        pending = self._pending
+
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+
+            if pending:
+                self.bursts += 1
+
+            while pending:
+                queued_at, message = pending.popleft()
+
+                try:
+                    self.transmit(message)
+                except OSError as error:
+                    self.errors += 1
+                    self.last_error = str(error)
+                    packet_log.log("error", "Send failed: {error}", error=error)
+                else:
+                    latency = time.monotonic_ns() - queued_at
+                    self.sent += 1
+                    self._latency_total_ns += latency
+                    if latency > self._latency_max_ns:
+                        self._latency_max_ns = latency
+
+                if self.pacing > 0 and pending:
+                    time.sleep(self.pacing)
+
+            if self._stopping:
+                return
@@ -0,0 +1,281 @@
+"""
+Multi-process UDP receive for large arenas.
+
+Responsibilities:
+- Start N worker processes that each bind the receive port with SO_REUSEPORT,
+  so the kernel spreads incoming datagrams across them
+- Parse and validate packets in the workers, off the game process's GIL
+- Forward each drained batch to the game process as one compact binary
+  record over a pipe
+- Rebuild parsed messages in the game process and hand them to a callback
+- While the service is capturing, also forward every raw datagram with its
+  receive time, so the game process can write it to the capture file
+
+Only available where the platform supports SO_REUSEPORT (Linux, macOS).
+"""
+
+import multiprocessing
+import select
+import socket
+import struct
+import threading
+import time
+from array import array
+from multiprocessing.connection import wait
+from typing import Callable, List, Optional
+
+from config import UDP_RECEIVE_PORT
+from udp import capture, packet_log
+from udp.pubsub import ReceivedBatch
+from udp.udp_service import ParsedMsg, _drain_socket, _new_buffer_pool, apply_buffer_sizes
+
+# Every pipe record starts with one type byte.
+# Parsed records: the batch's uint64 receive time (time.monotonic_ns(), which
+# is system-wide so comparable across processes), then three signed 32-bit
+# ints per message, (kind, a, b).
+# Raw records (only while capturing): per datagram a uint64 receive time, a
+# uint16 length and the payload.
+_RECORD_PARSED = 0
+_RECORD_RAW = 1
+_STAMP = struct.Struct("<Q")
+_RAW_HEADER = struct.Struct("<QH")
+_KIND_TAG = 0
+_KIND_CODE = 1
+_INT32_MIN = -(2 ** 31)
+_INT32_MAX = 2 ** 31 - 1
+
+# messages this worker process dropped because an ID did not fit in int32
+_dropped = 0
+
+
+def is_supported() -> bool:
+    """Return True if this platform can shard a port with SO_REUSEPORT."""
+    return hasattr(socket, "SO_REUSEPORT")
+
+
+def _encode_batch(batch: List[ParsedMsg]) -> bytes:
+    """Pack parsed messages into (kind, a, b) int32 triples. Messages with a
+    value that does not fit are logged and dropped."""
+
+    global _dropped
+    record = array("i")
+    received_ns = getattr(batch, "received_ns", None) or time.monotonic_ns()
+
+    for parsed in batch:
+        if parsed[0] == "tag":
+            _, shooter, target = parsed
+            if _INT32_MIN <= shooter <= _INT32_MAX and _INT32_MIN <= target <= _INT32_MAX:
+                record.extend((_KIND_TAG, shooter, target))
+                continue
+        else:
+            code = parsed[1]
+            if _INT32_MIN <= code <= _INT32_MAX:
+                record.extend((_KIND_CODE, code, 0))
+                continue
+
+        # the thread backend would accept these; make the difference visible
+        _dropped += 1
+        packet_log.log(
+            "warning", "Dropped {parsed}: ID outside the 32-bit range ({dropped} so far)",
+            parsed=parsed, dropped=_dropped,
+        )
+
+    return bytes((_RECORD_PARSED,)) + _STAMP.pack(received_ns) + record.tobytes()
+
+
+def _decode_batch(data: bytes) -> List[ParsedMsg]:
+    record = array("i")
+    record.frombytes(data[1 + _STAMP.size:])
+
+    batch = ReceivedBatch((), _STAMP.unpack_from(data, 1)[0])
+    for index in range(0, len(record), 3):
+        if record[index] == _KIND_TAG:
+            batch.append(("tag", record[index + 1], record[index + 2]))
+        else:
+            batch.append(("code", record[index + 1]))
+
+    return batch
+
+
+class _RawForwarder:
+    """
+    Stands in for a PacketRecorder inside a worker: collects the raw
+    datagrams _drain_socket reads, to be sent to the game process.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def record(self, direction: int, payload) -> None:
+        payload = bytes(payload)
+        self.chunks.append(_RAW_HEADER.pack(time.monotonic_ns(), len(payload)) + payload)
+
+    def take(self) -> bytes:
+        data = bytes((_RECORD_RAW,)) + b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _decode_raw(data: bytes):
+    """Yield (received_ns, payload) from a raw record."""
+    offset = 1
+    while offset < len(data):
+        received_ns, length = _RAW_HEADER.unpack_from(data, offset)
+        offset += _RAW_HEADER.size
+        yield received_ns, data[offset:offset + length]
+        offset += length
+
+
+def _worker_main(bind_address: str, port: int, conn, stop_event, capture_event) -> None:
+    """
+    Worker process: receive on the shared port, parse, forward batches.
+    While `capture_event` is set, raw datagrams are forwarded as well.
+    """
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    apply_buffer_sizes(sock)
+    sock.bind((bind_address, port))
+    sock.setblocking(False)
+    views = _new_buffer_pool()
+    forwarder = _RawForwarder()
+
+    try:
+        while not stop_event.is_set():
+            readable, _, _ = select.select([sock], [], [], 0.5)
+            if not readable:
+                continue
+
+            batch = _drain_socket(sock, views, forwarder if capture_event.is_set() else None)
+            if forwarder.chunks:
+                conn.send_bytes(forwarder.take())
+            if batch:
+                conn.send_bytes(_encode_batch(batch))
+    except (OSError, EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        sock.close()
+        conn.close()
+        packet_log.get_packet_log().stop()
+
+
+class ShardedReceiver:
+    """
+    Runs the receive workers and a collector thread in the game process
+    that passes each forwarded batch to `on_batch`.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        on_batch: Callable[[List[ParsedMsg]], None],
+        port: int = UDP_RECEIVE_PORT,
+        bind_address: str = "0.0.0.0",
+    ):
+        self.workers = workers
+        self.on_batch = on_batch
+        self.port = port
+        self.bind_address = bind_address
+
+        # spawn, not fork: the game process already runs Tk and other threads
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = None
+        self._capture_event = None
+        # PacketRecorder that forwarded raw datagrams are written to
+        self.recorder = None
+        self._processes = []
+        self._connections = []
+        self._collector: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if not is_supported():
+            raise OSError("SO_REUSEPORT is not available on this platform")
+
+        if self._processes:
+            return
+
+        self._stop_event = self._context.Event()
+        self._capture_event = self._context.Event()
+        if self.recorder is not None:
+            self._capture_event.set()
+
+        for index in range(self.workers):
+            receive_end, send_end = self._context.Pipe(duplex=False)
+            process = self._context.Process(
+                target=_worker_main,
+                args=(
+                    self.bind_address, self.port, send_end,
+                    self._stop_event, self._capture_event,
+                ),
+                name=f"udp-receive-{index}",
+                daemon=True,
+            )
+            process.start()
+            send_end.close()
+
+            self._processes.append(process)
+            self._connections.append(receive_end)
+
+        self._collector = threading.Thread(
+            target=self._collect_loop, name="udp-shard-collector", daemon=True
+        )
+        self._collector.start()
+
+        packet_log.log(
+            "service", "Listening on {address}:{port} with {workers} worker processes",
+            address=self.bind_address, port=self.port, workers=self.workers,
+        )
+
+    def set_recorder(self, recorder) -> None:
+        """Write received datagrams to `recorder` (a PacketRecorder), or stop with None."""
+        self.recorder = recorder
+        if self._capture_event is not None:
+            if recorder is not None:
+                self._capture_event.set()
+            else:
+                self._capture_event.clear()
+
+    def stop(self) -> None:
+        if self._stop_event is None:
+            return
+
+        self._stop_event.set()
+
+        for process in self._processes:
+            process.join(1.0)
+            if process.is_alive():
+                process.terminate()
+
+        if self._collector is not None:
+            self._collector.join(1.0)
+            self._collector = None
+
+        for conn in self._connections:
+            conn.close()
+
+        self._processes = []
+        self._connections = []
+        self._stop_event = None
+        self._capture_event = None
+
+    def _collect_loop(self) -> None:
+        connections = list(self._connections)
+
+        while connections:
+            for conn in wait(connections, timeout=0.5):
+                try:
+                    data = conn.recv_bytes()
+                except (EOFError, OSError):
+                    connections.remove(conn)
+                    continue
+
+                if data[0] == _RECORD_RAW:
+                    recorder = self.recorder
+                    if recorder is not None:
+                        for received_ns, payload in _decode_raw(data):
+                            recorder.record(capture.INBOUND, payload, received_ns)
+                    continue
+
+                batch = _decode_batch(data)
+                if batch:
+                    self.on_batch(batch)
@@ -5,51 +5,540 @@ Responsibilities:
 - Broadcast equipment IDs on UDP port 7500
 - Receive tag events on UDP port 7501
 - Support configurable network address
-- Dispatch parsed messages to a registered callback
+- Dispatch parsed messages to any number of subscribers (udp.pubsub)
+- Drain queued datagrams in batches so bursts cost one wakeup, not one per packet
+- Optionally run on the asyncio backend (udp.async_service) instead of the
+  listener thread, selected with config.UDP_BACKEND or set_backend()
+- Log packets through udp.packet_log, which samples and writes off-thread
+- Send through udp.sender's queue so callers never block on the socket
+- Optionally receive in several worker processes (udp.sharded_receiver),
+  selected with config.UDP_RECEIVE_WORKERS
+- Record traffic to a capture file (udp.capture) and accept replayed payloads
+- Size socket buffers and watch the kernel drop counter (udp.drop_monitor)
+
+Each arena is one UdpService instance, parameterised by its ports and
+addresses. Every thread-backend instance in the process is served by one
+shared receive thread, and asyncio instances share one event loop, so
+running several arenas side by side doesn't add a listener per field:
+
+    field_a = UdpService(receive_port=7501, broadcast_port=7500)
+    field_b = UdpService(receive_port=7511, broadcast_port=7510)
+
+Subscribers across arenas can also share one worker pool, see
+get_shared_executor().
+
+The module-level functions (start, send_message, set_message_handler, ...)
+operate on a default instance built from config.py, which is what the
+Tk screens use.
 """
 
+import selectors
 import socket
 import threading
-from typing import Callable, Optional, Tuple, Union
-
-from config import UDP_BROADCAST_ADDRESS, UDP_BROADCAST_PORT, UDP_RECEIVE_PORT
-
-_send_sock: Optional[socket.socket] = None
-_recv_sock: Optional[socket.socket] = None
-
-_broadcast_address: str = UDP_BROADCAST_ADDRESS
-
-_listener_thread: Optional[threading.Thread] = None
-_stop_event = threading.Event()
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from config import (
+    UDP_BACKEND,
+    UDP_BROADCAST_ADDRESS,
+    UDP_BROADCAST_PORT,
+    UDP_CAPTURE_PATH,
+    UDP_RECEIVE_PORT,
+    UDP_RECEIVE_WORKERS,
+    UDP_RECV_BUFFER_BYTES,
+    UDP_SEND_BUFFER_BYTES,
+    UDP_SEND_TIMEOUT,
+    UDP_SHARED_WORKERS,
+)
+from udp import capture, packet_log
+from udp.capture import PacketRecorder
+from udp.drop_monitor import KernelDropMonitor
+from udp.pubsub import MESSAGE_KINDS, ReceivedBatch, SubscriberRegistry, Subscription
+from udp.sender import PacketSender
+
+BACKENDS = ("thread", "asyncio")
 
 # Parsed message types:
 # - ("tag", shooter_id, target_id) for "int:int"
 # - ("code", code_int) for "int"
 ParsedMsg = Union[Tuple[str, int, int], Tuple[str, int]]
 
-_message_handler: Optional[Callable[[ParsedMsg], None]] = None
+# Receive buffer pool: one preallocated buffer per datagram in a batch,
+# reused on every drain so bursts don't allocate per packet.
+_RECV_BUFFER_SIZE = 4096
+_RECV_BATCH_SIZE = 64
 
+# Parsed tuples keyed by raw payload. A game only ever sees a few hundred
+# distinct payloads (shooter/target pairs, base hits, codes), so repeats
+# reuse one immutable tuple instead of parsing again.
+_PARSE_CACHE_LIMIT = 4096
+_parse_cache: Dict[bytes, ParsedMsg] = {}
 
-def start() -> None:
+
+class UdpService:
     """
-    Initialize UDP sockets and start the receive listener.
-    This function should be called once when the application starts.
+    One arena's UDP traffic: sockets, sender queue, subscribers, capture
+    and drop monitoring.
+    """
+
+    def __init__(
+        self,
+        receive_port: int = UDP_RECEIVE_PORT,
+        broadcast_port: int = UDP_BROADCAST_PORT,
+        broadcast_address: str = UDP_BROADCAST_ADDRESS,
+        bind_address: str = "0.0.0.0",
+        backend: str = UDP_BACKEND,
+        receive_workers: int = UDP_RECEIVE_WORKERS,
+        capture_path: Optional[str] = None,
+    ):
+        self.receive_port = receive_port
+        self.broadcast_port = broadcast_port
+        self.broadcast_address = broadcast_address
+        self.bind_address = bind_address
+        self.receive_workers = receive_workers
+        self.capture_path = capture_path
+        self.set_backend(backend)
+
+        self._send_sock: Optional[socket.socket] = None
+        self._recv_sock: Optional[socket.socket] = None
+        self._recv_views: List[memoryview] = []
+
+        # AsyncUdpService instance when the asyncio backend is selected
+        self._async_service = None
+        # ShardedReceiver instance when receive worker processes are enabled
+        self._sharded_receiver = None
+
+        self._sender: Optional[PacketSender] = None
+        self._drop_monitor = KernelDropMonitor(receive_port)
+        self.recorder: Optional[PacketRecorder] = None
+
+        self._subscribers = SubscriberRegistry()
+
+        # Subscriptions backing the single-slot set_*_handler() helpers
+        self._message_handler: Optional[Subscription] = None
+        self._batch_handler: Optional[Subscription] = None
+
+    def start(self) -> None:
+        """
+        Initialize UDP sockets and start receiving.
+        Calling it again on a running service does nothing.
+        """
+
+        if self.capture_path and self.recorder is None:
+            self.start_capture(self.capture_path)
+
+        self._drop_monitor.start()
+
+        if self.backend == "asyncio":
+            if self._async_service is None:
+                from udp.async_service import AsyncUdpService
+
+                self._async_service = AsyncUdpService(
+                    receive_port=self.receive_port,
+                    broadcast_port=self.broadcast_port,
+                    broadcast_address=self.broadcast_address,
+                    bind_address=self.bind_address,
+                )
+                self._async_service.set_batch_message_handler(self._dispatch_batch)
+                self._async_service.recorder = self.recorder
+            self._async_service.start()
+            return
+
+        if self._send_sock is None:
+            self._send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._send_sock.settimeout(UDP_SEND_TIMEOUT)
+            apply_buffer_sizes(self._send_sock)
+
+        if self._sender is None:
+            self._sender = PacketSender(self._transmit, name=f"udp-sender-{self.broadcast_port}")
+        self._sender.start()
+
+        if self.receive_workers > 0:
+            if self._sharded_receiver is None:
+                from udp.sharded_receiver import ShardedReceiver
+
+                self._sharded_receiver = ShardedReceiver(
+                    self.receive_workers, self._dispatch_batch, self.receive_port,
+                    self.bind_address,
+                )
+                self._sharded_receiver.set_recorder(self.recorder)
+            self._sharded_receiver.start()
+            return
+
+        if self._recv_sock is None:
+            self._recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            apply_buffer_sizes(self._recv_sock)
+            self._recv_sock.bind((self.bind_address, self.receive_port))
+            self._recv_sock.setblocking(False)
+
+            if not self._recv_views:
+                self._recv_views = _new_buffer_pool()
+            _receive_hub.add(self._recv_sock, self)
+            packet_log.log(
+                "service", "Listening on {address}:{port}",
+                address=self.bind_address, port=self.receive_port,
+            )
+
+    def stop(self) -> None:
+        """
+        Stop receiving and close sockets.
+        Safe to call on app shutdown.
+        """
+
+        if self._async_service is not None:
+            self._async_service.stop()
+            self._async_service = None
+
+        if self._sharded_receiver is not None:
+            self._sharded_receiver.stop()
+            self._sharded_receiver = None
+
+        self._drop_monitor.stop()
+        packet_log.get_packet_log().flush()
+
+        if self._recv_sock is not None:
+            _receive_hub.remove(self._recv_sock)
+            try:
+                self._recv_sock.close()
+            except OSError:
+                pass
+            self._recv_sock = None
+
+        # flush queued replies (e.g. the final 221s) before closing the socket
+        if self._sender is not None:
+            self._sender.stop()
+
+        if self._send_sock is not None:
+            try:
+                self._send_sock.close()
+            except OSError:
+                pass
+            self._send_sock = None
+
+        self.stop_capture()
+
+    def get_backend(self) -> str:
+        """Return the name of the selected UDP backend."""
+        return self.backend
+
+    def set_backend(self, name: str) -> None:
+        """
+        Select the UDP backend ("thread" or "asyncio").
+        Must be called before start(); the running backend is not switched.
+        """
+
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown UDP backend {name!r}, expected one of {BACKENDS}")
+
+        self.backend = name
+
+    def get_broadcast_address(self) -> str:
+        """Return the current UDP broadcast address."""
+        return self.broadcast_address
+
+    def set_broadcast_address(self, address: str) -> None:
+        """
+        Update the network address used for UDP broadcasts.
+        """
+
+        self.broadcast_address = address.strip()
+
+        if self._async_service is not None:
+            self._async_service.set_broadcast_address(self.broadcast_address)
+
+    def subscribe(
+        self,
+        callback: Callable,
+        kinds: Iterable[str] = MESSAGE_KINDS,
+        mode: str = "sync",
+        batch: bool = True,
+        executor: Optional[Executor] = None,
+    ) -> Subscription:
+        """
+        Subscribe to parsed UDP messages.
+
+        kinds    - message types to receive ("tag", "code")
+        mode     - "sync" runs the callback on the receive thread; "executor"
+                   runs it on its own worker so it can never delay other
+                   subscribers
+        batch    - True passes a list per received batch, False one message
+                   per call
+        executor - shared executor to use instead of a dedicated worker
+
+        Returns the subscription, to be passed to unsubscribe().
+        """
+
+        subscription = Subscription(callback, kinds, mode, batch, executor)
+        return self._subscribers.add(subscription)
+
+    def unsubscribe(self, subscription: Optional[Subscription]) -> None:
+        """Remove a subscription returned by subscribe()."""
+        self._subscribers.remove(subscription)
+
+    def set_message_handler(self, handler: Optional[Callable[[ParsedMsg], None]]) -> None:
+        """
+        Register a callback that receives parsed UDP messages.
+        Replaces the handler from a previous call; None removes it.
+        """
+
+        self.unsubscribe(self._message_handler)
+        self._message_handler = None
+        if handler is not None:
+            self._message_handler = self.subscribe(handler, batch=False)
+
+    def set_batch_message_handler(
+        self, handler: Optional[Callable[[List[ParsedMsg]], None]]
+    ) -> None:
+        """
+        Register a callback that receives every parsed message from one
+        drain of the receive socket as a single list.
+        Replaces the handler from a previous call; None removes it.
+        """
+
+        self.unsubscribe(self._batch_handler)
+        self._batch_handler = None
+        if handler is not None:
+            self._batch_handler = self.subscribe(handler)
+
+    def send_message(self, value: int) -> None:
+        """
+        Broadcast a single integer message over UDP.
+        Used for equipment IDs, 202, 221, and gameplay reply packets.
+        The message is queued for the sender thread; this never blocks.
+        """
+
+        if self._async_service is None and self._send_sock is None:
+            self.start()
+
+        if self._async_service is not None:
+            self._async_service.send_message(value)
+            return
+
+        message = str(int(value)).encode("ascii")
+        if not self._sender.submit(message):
+            packet_log.log("error", "Send queue full, dropped {value}", value=value)
+
+    def send_equipment_id(self, equipment_id: int) -> None:
+        """
+        Broadcast the given equipment ID over UDP.
+        This is called after a player is assigned an equipment ID.
+        """
+        self.send_message(equipment_id)
+
+    def start_capture(self, path: str) -> PacketRecorder:
+        """
+        Record this service's traffic to `path`, replacing any open capture.
+        An existing capture file is appended to, never truncated.
+        """
+
+        self.stop_capture()
+        self.recorder = PacketRecorder(path)
+        if self._async_service is not None:
+            self._async_service.recorder = self.recorder
+        if self._sharded_receiver is not None:
+            self._sharded_receiver.set_recorder(self.recorder)
+        return self.recorder
+
+    def stop_capture(self) -> None:
+        """Close the capture file, if any."""
+
+        recorder = self.recorder
+        self.recorder = None
+        if self._async_service is not None:
+            self._async_service.recorder = None
+        if self._sharded_receiver is not None:
+            self._sharded_receiver.set_recorder(None)
+        if recorder is not None:
+            recorder.close()
+
+    def inject_datagrams(self, payloads) -> None:
+        """
+        Run raw payloads through the normal parse and dispatch path as one
+        batch, as if they had just been received. Used to replay captures.
+        """
+
+        batch: List[ParsedMsg] = []
+        for payload in payloads:
+            parsed = _decode_datagram(payload, "replay")
+            if parsed is not None:
+                batch.append(parsed)
+
+        if batch:
+            self._dispatch_batch(batch)
+
+    def get_kernel_drops(self) -> int:
+        """
+        Return how many datagrams the kernel dropped on the receive port
+        since the service started (always 0 where this can't be measured).
+        """
+        return self._drop_monitor.drops
+
+    def get_send_stats(self) -> Dict[str, float]:
+        """
+        Return outbound counters: pending, sent, errors, dropped, bursts and
+        enqueue-to-send latency.
+        """
+
+        if self._sender is None:
+            return {}
+        return self._sender.stats()
+
+    def _transmit(self, message: bytes) -> None:
+        """Sender thread: write one message to the broadcast address."""
+
+        sock = self._send_sock
+        if sock is None:
+            raise OSError("UDP send socket is closed")
+        sock.sendto(message, (self.broadcast_address, self.broadcast_port))
+
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(capture.OUTBOUND, message)
+
+    def _dispatch_batch(self, batch: List[ParsedMsg]) -> None:
+        """
+        Publish a batch of parsed messages to every subscriber.
+        """
+        self._subscribers.publish(batch)
+
+
+class _ReceiveHub:
+    """
+    The one listener thread shared by every thread-backend UdpService.
+
+    Waits on all registered receive sockets at once, then drains every
+    queued datagram from each readable socket without blocking and
+    dispatches them as one batch to the owning service. The thread exits
+    when the last socket is removed and restarts on the next add().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake_recv: Optional[socket.socket] = None
+        self._wake_send: Optional[socket.socket] = None
+        self._sockets = 0
+
+    def add(self, sock: socket.socket, service: UdpService) -> None:
+        with self._lock:
+            if self._selector is None:
+                self._selector = selectors.DefaultSelector()
+                self._wake_recv, self._wake_send = socket.socketpair()
+                self._wake_recv.setblocking(False)
+                self._selector.register(self._wake_recv, selectors.EVENT_READ, None)
+
+            self._selector.register(sock, selectors.EVENT_READ, service)
+            self._sockets += 1
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._listen_loop, args=(self._selector,),
+                    name="udp-receive", daemon=True,
+                )
+                self._thread.start()
+
+        self._wake()
+
+    def remove(self, sock: socket.socket) -> None:
+        with self._lock:
+            if self._selector is None:
+                return
+            try:
+                self._selector.unregister(sock)
+            except (KeyError, ValueError):
+                return
+            self._sockets -= 1
+
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_send.send(b"\0")
+        except (AttributeError, OSError):
+            pass
+
+    def _listen_loop(self, selector: selectors.BaseSelector) -> None:
+        while True:
+            with self._lock:
+                if self._sockets == 0:
+                    self._close_selector()
+                    return
+
+            try:
+                events = selector.select()
+            except (OSError, ValueError):
+                continue
+
+            for key, _ in events:
+                service = key.data
+
+                if service is None:
+                    try:
+                        key.fileobj.recv(4096)
+                    except OSError:
+                        pass
+                    continue
+
+                try:
+                    batch = _drain_socket(key.fileobj, service._recv_views, service.recorder)
+                except OSError:
+                    # closed under us by stop(); remove() already unregistered it
+                    continue
+
+                if batch:
+                    service._dispatch_batch(batch)
+
+    def _close_selector(self) -> None:
+        """Called with the lock held once no sockets remain."""
+
+        self._selector.close()
+        self._selector = None
+        self._wake_recv.close()
+        self._wake_send.close()
+        self._wake_recv = None
+        self._wake_send = None
+        self._thread = None
+
+
+_receive_hub = _ReceiveHub()
+
+_default_service = UdpService(capture_path=UDP_CAPTURE_PATH)
+
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_default_service() -> UdpService:
+    """Return the service configured from config.py, used by the screens."""
+    return _default_service
+
+
+def get_shared_executor() -> ThreadPoolExecutor:
+    """
+    Return a worker pool that subscribers of many services can share
+    (pass it as subscribe(..., mode="executor", executor=...)), instead of
+    one dedicated worker per subscriber. Messages for one subscriber may
+    then run concurrently, so its callback must be thread-safe.
     """
 
-    global _send_sock, _recv_sock, _listener_thread
+    global _shared_executor
 
-    if _send_sock is None:
-        _send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    with _shared_executor_lock:
+        if _shared_executor is None:
+            _shared_executor = ThreadPoolExecutor(
+                max_workers=UDP_SHARED_WORKERS, thread_name_prefix="udp-shared"
+            )
+        return _shared_executor
 
-    if _recv_sock is None:
-        _recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        _recv_sock.bind(("0.0.0.0", UDP_RECEIVE_PORT))
-        _recv_sock.settimeout(0.5)
 
-    if _listener_thread is None or not _listener_thread.is_alive():
-        _stop_event.clear()
-        _listener_thread = threading.Thread(target=_listen_loop, daemon=True)
-        _listener_thread.start()
+def start() -> None:
+    """
+    Initialize UDP sockets and start the receive listener.
+    This function should be called once when the application starts.
+    """
+    _default_service.start()
 
 
 def stop() -> None:
@@ -57,46 +546,65 @@ def stop() -> None:
     Stop the receive listener and close sockets.
     Safe to call on app shutdown.
     """
+    _default_service.stop()
 
-    global _send_sock, _recv_sock
 
-    _stop_event.set()
+def get_backend() -> str:
+    """Return the name of the selected UDP backend."""
+    return _default_service.get_backend()
 
-    if _recv_sock is not None:
-        try:
-            _recv_sock.close()
-        except OSError:
-            pass
-        _recv_sock = None
 
-    if _send_sock is not None:
-        try:
-            _send_sock.close()
-        except OSError:
-            pass
-        _send_sock = None
+def set_backend(name: str) -> None:
+    """
+    Select the UDP backend ("thread" or "asyncio").
+    Must be called before start(); the running backend is not switched.
+    """
+    _default_service.set_backend(name)
 
 
 def get_broadcast_address() -> str:
     """Return the current UDP broadcast address."""
-    return _broadcast_address
+    return _default_service.get_broadcast_address()
 
 
 def set_broadcast_address(address: str) -> None:
     """
     Update the network address used for UDP broadcasts.
     """
+    _default_service.set_broadcast_address(address)
+
+
+def subscribe(
+    callback: Callable,
+    kinds: Iterable[str] = MESSAGE_KINDS,
+    mode: str = "sync",
+    batch: bool = True,
+    executor: Optional[Executor] = None,
+) -> Subscription:
+    """Subscribe to parsed UDP messages. See UdpService.subscribe()."""
+    return _default_service.subscribe(callback, kinds, mode, batch, executor)
 
-    global _broadcast_address
-    _broadcast_address = address.strip()
+
+def unsubscribe(subscription: Optional[Subscription]) -> None:
+    """Remove a subscription returned by subscribe()."""
+    _default_service.unsubscribe(subscription)
 
 
 def set_message_handler(handler: Optional[Callable[[ParsedMsg], None]]) -> None:
     """
     Register a callback that receives parsed UDP messages.
     """
-    global _message_handler
-    _message_handler = handler
+    _default_service.set_message_handler(handler)
+
+
+def set_batch_message_handler(
+    handler: Optional[Callable[[List[ParsedMsg]], None]]
+) -> None:
+    """
+    Register a callback that receives every parsed message from one
+    drain of the receive socket as a single list.
+    """
+    _default_service.set_batch_message_handler(handler)
 
 
 def send_message(value: int) -> None:
@@ -104,12 +612,7 @@ def send_message(value: int) -> None:
     Broadcast a single integer message over UDP.
     Used for equipment IDs, 202, 221, and gameplay reply packets.
     """
-
-    if _send_sock is None:
-        start()
-
-    message = str(int(value)).encode("ascii")
-    _send_sock.sendto(message, (_broadcast_address, UDP_BROADCAST_PORT))
+    _default_service.send_message(value)
 
 
 def send_equipment_id(equipment_id: int) -> None:
@@ -117,39 +620,145 @@ def send_equipment_id(equipment_id: int) -> None:
     Broadcast the given equipment ID over UDP.
     This is called after a player is assigned an equipment ID.
     """
-    send_message(equipment_id)
+    _default_service.send_equipment_id(equipment_id)
 
 
-def _listen_loop() -> None:
+def start_capture(path: str) -> PacketRecorder:
+    """Record all UDP traffic of the default service to `path`."""
+    return _default_service.start_capture(path)
+
+
+def stop_capture() -> None:
+    """Close the default service's capture file, if any."""
+    _default_service.stop_capture()
+
+
+def inject_datagrams(payloads) -> None:
     """
-    Background thread: listen for UDP on 7501 and dispatch parsed messages.
+    Run raw payloads through the default service's parse and dispatch path.
+    """
+    _default_service.inject_datagrams(payloads)
+
+
+def get_kernel_drops() -> int:
     """
+    Return how many datagrams the kernel dropped on the receive port
+    since the service started (always 0 where this can't be measured).
+    """
+    return _default_service.get_kernel_drops()
+
+
+def get_send_stats() -> Dict[str, float]:
+    """
+    Return outbound counters: pending, sent, errors, dropped, bursts and
+    enqueue-to-send latency.
+    """
+    return _default_service.get_send_stats()
+
+
+def apply_buffer_sizes(sock: socket.socket) -> None:
+    """
+    Apply the configured SO_RCVBUF / SO_SNDBUF sizes to a socket.
+    """
+
+    try:
+        if UDP_RECV_BUFFER_BYTES:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RECV_BUFFER_BYTES)
+        if UDP_SEND_BUFFER_BYTES:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, UDP_SEND_BUFFER_BYTES)
+    except OSError as error:
+        packet_log.log("warning", "Could not size socket buffers: {error}", error=error)
+
+
+def _new_buffer_pool() -> List[memoryview]:
+    """Allocate one receive batch worth of reusable datagram buffers."""
+    return [memoryview(bytearray(_RECV_BUFFER_SIZE)) for _ in range(_RECV_BATCH_SIZE)]
 
-    print(f"[UDP] Listening on 0.0.0.0:{UDP_RECEIVE_PORT}", flush=True)
 
-    while not _stop_event.is_set():
+def _drain_socket(
+    sock: socket.socket,
+    views: List[memoryview],
+    recorder: Optional[PacketRecorder] = None,
+) -> List[ParsedMsg]:
+    """
+    Read every datagram currently queued on the non-blocking socket,
+    up to one buffer pool's worth, and return the parsed messages stamped
+    with the time the first datagram was read.
+    """
+
+    batch = ReceivedBatch()
+
+    for view in views:
         try:
-            assert _recv_sock is not None
-            data, addr = _recv_sock.recvfrom(4096)
-        except socket.timeout:
-            continue
-        except OSError:
+            size, addr = sock.recvfrom_into(view)
+        except (BlockingIOError, InterruptedError):
             break
 
-        text = data.decode("ascii", errors="ignore").strip()
-        parsed = _parse_message(text)
+        if batch.received_ns is None:
+            batch.received_ns = time.monotonic_ns()
+
+        if recorder is not None:
+            recorder.record(capture.INBOUND, view[:size])
+
+        parsed = _decode_datagram(view[:size], addr)
+        if parsed is not None:
+            batch.append(parsed)
+
+    return batch
+
+
+def _decode_datagram(data, addr) -> Optional[ParsedMsg]:
+    """
+    Parse one raw datagram, logging it along with the sender address.
+    Logging only queues a record; the packet log's writer thread does the I/O.
+    """
+
+    payload = bytes(data)
+    parsed = _parse_datagram(payload)
+
+    if parsed is None:
+        packet_log.log(
+            "unrecognized", "From {addr}: Unrecognized payload {payload!r}",
+            addr=addr, payload=payload,
+        )
+        return None
+
+    packet_log.log(parsed[0], "From {addr}: {parsed}", addr=addr, parsed=parsed)
+    return parsed
+
+
+def _parse_datagram(data: bytes) -> Optional[ParsedMsg]:
+    """
+    Parse a raw payload without decoding it to text first.
+    Accepts exactly what _parse_message accepts for the decoded payload.
+    """
+
+    if type(data) is not bytes:
+        data = bytes(data)
 
+    parsed = _parse_cache.get(data)
+    if parsed is not None:
+        return parsed
+
+    # int() parses ASCII digits from bytes directly and strips whitespace
+    colon = data.find(b":")
+    try:
+        if colon < 0:
+            parsed = ("code", int(data))
+        else:
+            parsed = ("tag", int(data[:colon]), int(data[colon + 1:]))
+    except ValueError:
+        # empty, malformed or non-ASCII payloads take the text path so both
+        # parsers agree on every input
+        parsed = _parse_message(data.decode("ascii", errors="ignore").strip())
         if parsed is None:
-            print(f"[UDP] From {addr}: Unrecognized payload {data!r}", flush=True)
-            continue
+            return None
 
-        print(f"[UDP] From {addr}: {parsed}", flush=True)
+    if len(_parse_cache) >= _PARSE_CACHE_LIMIT:
+        _parse_cache.clear()
+    _parse_cache[data] = parsed
 
-        if _message_handler is not None:
-            try:
-                _message_handler(parsed)
-            except Exception as error:
-                print(f"[UDP] Handler error: {error}", flush=True)
+    return parsed
 
 
 def _parse_message(text: str) -> Optional[ParsedMsg]:
@@ -178,4 +787,4 @@ def _parse_message(text: str) -> Optional[ParsedMsg]:
         code = int(text)
         return ("code", code)
     except ValueError:
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+wakeup.py - Waking the Tk Thread From Other Threads
+
+TkWakeup lets a background thread (e.g. the UDP receiver) tell the Tk
+thread that work is waiting, without the Tk thread polling for it:
+- on Unix a self-pipe is registered with Tk's createfilehandler, so the
+  event loop wakes as soon as a byte is written
+- repeated notifications before the Tk thread runs coalesce into one
+  wakeup
+- where file handlers are unavailable (Windows) it falls back to polling
+  on the screen scheduler
+"""
+
+import os
+import threading
+import tkinter as tk
+
+from config import UI_WAKEUP_FALLBACK_MS
+from scheduler import get_scheduler
+
+
+class TkWakeup:
+    """Runs `callback` on the Tk thread after notify() is called from any thread."""
+
+    def __init__(self, widget, callback, fallback_ms=UI_WAKEUP_FALLBACK_MS):
+        self.widget = widget
+        self.callback = callback
+        self.fallback_ms = fallback_ms
+        self.wakeups = 0
+
+        self._signalled = False
+        self._read_fd = None
+        self._write_fd = None
+        # held around writing to and closing _write_fd, so notify() can never
+        # write to a descriptor number close() has released
+        self._write_lock = threading.Lock()
+        self._poll_task = None
+
+        try:
+            read_fd, write_fd = os.pipe()
+        except OSError:
+            read_fd = write_fd = None
+
+        if read_fd is not None:
+            try:
+                os.set_blocking(read_fd, False)
+                os.set_blocking(write_fd, False)
+                widget.tk.createfilehandler(read_fd, tk.READABLE, self._on_readable)
+                self._read_fd, self._write_fd = read_fd, write_fd
+            except (AttributeError, OSError, tk.TclError):
+                os.close(read_fd)
+                os.close(write_fd)
+
+        if self._read_fd is None:
+            self._poll_task = get_scheduler(widget).every(
+                fallback_ms / 1000, self._poll, name="udp-poll"
+            )
+
+    @property
+    def event_driven(self):
+        return self._read_fd is not None
+
+    def notify(self):
+        """Request a callback on the Tk thread. Safe from any thread."""
+        if self._signalled or self._write_fd is None:
+            return
+
+        self._signalled = True
+        with self._write_lock:
+            if self._write_fd is None:
+                # closed since the check above
+                return
+            try:
+                os.write(self._write_fd, b"\0")
+            except (BlockingIOError, OSError):
+                # a full pipe already guarantees a wakeup
+                pass
+
+    def close(self):
+        if self._poll_task is not None:
+            get_scheduler(self.widget).cancel(self._poll_task)
+            self._poll_task = None
+
+        if self._read_fd is not None:
+            with self._write_lock:
+                write_fd, self._write_fd = self._write_fd, None
+                os.close(write_fd)
+
+            read_fd, self._read_fd = self._read_fd, None
+            try:
+                self.widget.tk.deletefilehandler(read_fd)
+            except tk.TclError:
+                pass
+            os.close(read_fd)
+
+    def _on_readable(self, fd, mask):
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+        # cleared before the callback, so work queued while it runs
+        # schedules another wakeup
+        self._signalled = False
+        self.wakeups += 1
+        self.callback()
+
+    def _poll(self):
+        self.wakeups += 1
+        self.callback()